@@ -6,7 +6,7 @@ import json
 import yaml
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional
 from dact.logger import log
 
 
@@ -18,6 +18,10 @@ class DataProvider(ABC):
         """Load test data from the specified source."""
         pass
     
+    def load_data_iter(self, source: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over test data rows; providers that can parse incrementally override this."""
+        return iter(self.load_data(source))
+    
     @abstractmethod
     def validate_data_schema(self, data: List[Dict], schema: Dict) -> bool:
         """Validate that the data matches the expected schema."""
@@ -29,21 +33,10 @@ class CSVDataProvider(DataProvider):
     
     def load_data(self, source: str) -> List[Dict[str, Any]]:
         """Load data from a CSV file."""
-        data = []
-        source_path = Path(source)
-        
-        if not source_path.exists():
-            raise FileNotFoundError(f"CSV file not found: {source}")
+        rows = self.load_data_iter(source)
         
         try:
-            with open(source_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    # Convert string values to appropriate types
-                    converted_row = {}
-                    for key, value in row.items():
-                        converted_row[key] = self._convert_value(value)
-                    data.append(converted_row)
+            data = list(rows)
             
             log.info(f"Loaded {len(data)} rows from CSV file: {source}")
             return data
@@ -51,6 +44,27 @@ class CSVDataProvider(DataProvider):
         except Exception as e:
             raise ValueError(f"Failed to load CSV file {source}: {e}")
     
+    def load_data_iter(self, source: str) -> Iterator[Dict[str, Any]]:
+        """Yield converted rows one at a time while the CSV file is read."""
+        source_path = Path(source)
+        
+        # Checked here, not inside the generator, so a missing file fails at the call
+        if not source_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {source}")
+        
+        return self._iter_file(source_path)
+    
+    def _iter_file(self, source_path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield rows from the file, keeping it open only while iterating."""
+        with open(source_path, 'r', encoding='utf-8', newline='') as csvfile:
+            yield from self._iter_from_stream(csvfile)
+    
+    def _iter_from_stream(self, fp: IO[str]) -> Iterator[Dict[str, Any]]:
+        """Yield converted rows from an open CSV text stream."""
+        for row in csv.DictReader(fp):
+            # Convert string values to appropriate types
+            yield {key: self._convert_value(value) for key, value in row.items()}
+    
     def validate_data_schema(self, data: List[Dict], schema: Dict) -> bool:
         """Validate CSV data against a schema."""
         if not data:
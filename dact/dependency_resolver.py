@@ -1,11 +1,46 @@
 """
 Dependency resolution and visualization for DACT scenarios.
 """
-from typing import Dict, List, Set, Tuple, Optional
+import functools
+import re
+import sys
+from typing import Any, Dict, FrozenSet, List, Set, Tuple, Optional
 from dataclasses import dataclass
 from dact.models import Scenario, Step
 
 
+# Matches {{ steps.step_name.* }} references in parameter values
+_STEP_REF_RE = re.compile(r'{{\s*steps\.([^.]+)\.')
+
+
+@functools.lru_cache(maxsize=4096)
+def _scan_string_for_step_refs(value: str) -> FrozenSet[str]:
+    """Return the step names referenced by a template string (cached per distinct string)."""
+    return frozenset(_STEP_REF_RE.findall(value))
+
+
+def _collect_step_refs(value: Any, dependencies: Set[str]) -> None:
+    """Add the step names referenced anywhere in a param value to dependencies."""
+    if isinstance(value, str):
+        # Literal values (no template) never reference a step; skip the cache lookup
+        if '{{' in value:
+            dependencies |= _scan_string_for_step_refs(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_step_refs(item, dependencies)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_step_refs(item, dependencies)
+
+
+def _invert_edges(edges: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """step -> steps that depend on it, in edge order."""
+    dependents: Dict[str, List[str]] = {}
+    for from_step, to_step in edges:
+        dependents.setdefault(from_step, []).append(to_step)
+    return dependents
+
+
 @dataclass
 class DependencyNode:
     """Represents a step node in the dependency graph."""
@@ -15,8 +50,12 @@ class DependencyNode:
     dependencies: List[str] = None
     
     def __post_init__(self):
+        # Step names are compared and hashed repeatedly while the graph is built; intern them
+        self.name = sys.intern(self.name)
         if self.dependencies is None:
             self.dependencies = []
+        else:
+            self.dependencies = [sys.intern(dep) for dep in self.dependencies]
 
 
 @dataclass
@@ -25,6 +64,7 @@ class DependencyGraph:
     nodes: Dict[str, DependencyNode]
     edges: List[Tuple[str, str]]  # (from_step, to_step)
     execution_order: List[List[str]]  # Groups of steps that can run in parallel
+    dependents: Dict[str, List[str]] = None  # step -> steps that depend on it (inverted edges)
     
     def __post_init__(self):
         if not self.nodes:
@@ -33,6 +73,8 @@ class DependencyGraph:
             self.edges = []
         if not self.execution_order:
             self.execution_order = []
+        if self.dependents is None:
+            self.dependents = _invert_edges(self.edges)
 
 
 class DependencyResolver:
@@ -73,71 +115,74 @@ class DependencyResolver:
             for dep in all_deps:
                 edges.append((dep, step.name))
         
+        # Inverted once, for both the execution order and the graph
+        dependents = _invert_edges(edges)
+        
         # Calculate execution order
-        execution_order = self._calculate_execution_order(nodes)
+        execution_order = self._calculate_execution_order(nodes, dependents)
         
         return DependencyGraph(
             nodes=nodes,
             edges=edges,
-            execution_order=execution_order
+            execution_order=execution_order,
+            dependents=dependents
         )
     
     def _extract_template_dependencies(self, step: Step) -> List[str]:
         """
         Extract step dependencies from Jinja2 template references.
         
-        Looks for patterns like {{ steps.step_name.outputs.* }} in parameter values.
+        Looks for patterns like {{ steps.step_name.outputs.* }} in parameter values,
+        including strings nested in dict and list params (they are rendered too).
         """
-        import re
-        
         dependencies = set()
         
         # Check all parameter values for step references
         for param_value in step.params.values():
-            if isinstance(param_value, str):
-                # Look for patterns like {{ steps.step_name.outputs.* }}
-                matches = re.findall(r'{{\s*steps\.([^.]+)\.', param_value)
-                dependencies.update(matches)
+            _collect_step_refs(param_value, dependencies)
         
         return list(dependencies)
     
-    def _calculate_execution_order(self, nodes: Dict[str, DependencyNode]) -> List[List[str]]:
+    def _calculate_execution_order(self, nodes: Dict[str, DependencyNode],
+                                   dependents: Optional[Dict[str, List[str]]] = None) -> List[List[str]]:
         """
-        Calculate the execution order using topological sorting.
+        Calculate the execution order using topological sorting (Kahn's algorithm).
         
-        Returns groups of steps that can be executed in parallel.
+        Returns groups of steps that can be executed in parallel. Each group is
+        the set of steps whose dependencies all ran in earlier groups, so the
+        graph is walked once and a cycle shows up as steps never becoming ready.
+        dependents (step -> steps waiting on it) is derived from nodes when not given.
         """
-        # Create a copy of dependencies for manipulation
-        remaining_deps = {}
-        for name, node in nodes.items():
-            remaining_deps[name] = set(node.dependencies)
+        # Number of unmet dependencies per step, and the steps waiting on each dependency
+        indegree = {name: len(set(node.dependencies)) for name, node in nodes.items()}
+        if dependents is None:
+            dependents = _invert_edges([(dep, name) for name, node in nodes.items()
+                                        for dep in set(node.dependencies)])
+        
+        # Steps within a group keep their order of definition in the scenario
+        position = {name: i for i, name in enumerate(nodes)}
         
         execution_order = []
-        processed = set()
-        
-        while remaining_deps:
-            # Find steps with no remaining dependencies
-            ready_steps = []
-            for step_name, deps in remaining_deps.items():
-                if not deps:
-                    ready_steps.append(step_name)
-            
-            if not ready_steps:
-                # Circular dependency detected
-                remaining_steps = list(remaining_deps.keys())
-                raise ValueError(f"Circular dependency detected among steps: {remaining_steps}")
-            
-            # Add ready steps to execution order
+        ready_steps = [name for name, count in indegree.items() if count == 0]
+        emitted = 0
+        
+        while ready_steps:
             execution_order.append(ready_steps)
-            processed.update(ready_steps)
+            emitted += len(ready_steps)
             
-            # Remove processed steps from dependencies
+            next_ready = []
             for step_name in ready_steps:
-                del remaining_deps[step_name]
-            
-            # Remove processed steps from other steps' dependencies
-            for deps in remaining_deps.values():
-                deps -= processed
+                for dependent in dependents.get(step_name, ()):
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        next_ready.append(dependent)
+            next_ready.sort(key=position.__getitem__)
+            ready_steps = next_ready
+        
+        if emitted < len(nodes):
+            # Circular dependency detected (or a dependency on a step that does not exist)
+            remaining_steps = [name for name, count in indegree.items() if count > 0]
+            raise ValueError(f"Circular dependency detected among steps: {remaining_steps}")
         
         return execution_order
     
@@ -172,36 +217,41 @@ class DependencyResolver:
         
         return errors
     
-    def get_step_dependencies(self, scenario: Scenario, step_name: str) -> List[str]:
-        """Get direct dependencies for a specific step."""
-        dependency_graph = self.extract_dependencies(scenario)
+    def get_step_dependencies(self, scenario: Scenario, step_name: str,
+                              graph: Optional[DependencyGraph] = None) -> List[str]:
+        """
+        Get direct dependencies for a specific step.
+        
+        Pass the graph from extract_dependencies to avoid extracting it again.
+        """
+        dependency_graph = graph or self.extract_dependencies(scenario)
         if step_name in dependency_graph.nodes:
-            return dependency_graph.nodes[step_name].dependencies
+            return list(dependency_graph.nodes[step_name].dependencies)
         return []
     
-    def get_step_dependents(self, scenario: Scenario, step_name: str) -> List[str]:
-        """Get steps that depend on the specified step."""
-        dependency_graph = self.extract_dependencies(scenario)
-        dependents = []
-        
-        for node in dependency_graph.nodes.values():
-            if step_name in node.dependencies:
-                dependents.append(node.name)
+    def get_step_dependents(self, scenario: Scenario, step_name: str,
+                            graph: Optional[DependencyGraph] = None) -> List[str]:
+        """
+        Get steps that depend on the specified step.
         
-        return dependents
+        Pass the graph from extract_dependencies to avoid extracting it again.
+        """
+        dependency_graph = graph or self.extract_dependencies(scenario)
+        return list(dependency_graph.dependents.get(step_name, []))
     
-    def generate_mermaid_diagram(self, scenario: Scenario) -> str:
+    def generate_mermaid_diagram(self, scenario: Scenario,
+                                 graph: Optional[DependencyGraph] = None) -> str:
         """
         Generate a Mermaid diagram representation of the scenario dependencies.
         """
-        dependency_graph = self.extract_dependencies(scenario)
+        dependency_graph = graph or self.extract_dependencies(scenario)
         
         lines = ["graph TD"]
         
         # Add nodes
         for node in dependency_graph.nodes.values():
             node_label = f"{node.name}[{node.name}<br/>({node.tool})]"
-            lines.append(f"    {node.name}[{node.name}<br/>({node.tool})]")
+            lines.append(f"    {node_label}")
         
         # Add edges
         for from_step, to_step in dependency_graph.edges:
@@ -217,11 +267,12 @@ class DependencyResolver:
         
         return "\n".join(lines)
     
-    def generate_text_summary(self, scenario: Scenario) -> str:
+    def generate_text_summary(self, scenario: Scenario,
+                              graph: Optional[DependencyGraph] = None) -> str:
         """
         Generate a text summary of the scenario dependencies.
         """
-        dependency_graph = self.extract_dependencies(scenario)
+        dependency_graph = graph or self.extract_dependencies(scenario)
         
         lines = [f"Dependency Analysis for Scenario: {scenario.name}"]
         lines.append("=" * 50)
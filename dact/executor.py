@@ -1,10 +1,11 @@
+import functools
 import subprocess
 import os
 import glob
 import re
 from pathlib import Path
 from typing import Dict, Any
-from jinja2 import Environment
+from jinja2 import Environment, Template
 from dact.models import Tool
 from dact.logger import log
 
@@ -41,14 +42,40 @@ def find_latest_file(dir: str, pattern: str) -> str:
     # Return the most recently created file
     return max(files, key=os.path.getctime)
 
+def _scan_onnx_files(dir: str):
+    """
+    Yields the paths glob("<dir>/**/*.onnx", recursive=True) matches, in the same order,
+    walking with os.scandir so no per-level pattern matching or sorting is done.
+    Hidden entries are skipped, as glob does.
+    """
+    try:
+        with os.scandir(dir) as it:
+            entries = [e for e in it if not e.name.startswith('.')]
+    except OSError:
+        return
+    for entry in entries:
+        # normcase: case-insensitive on Windows, like glob's matching
+        if os.path.normcase(entry.name).endswith(".onnx"):
+            yield entry.path
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        if is_dir:
+            yield from _scan_onnx_files(entry.path)
+
 def find_onnx_file(dir: str, pattern: str = "**/*.onnx") -> str:
     """
     Dynamically finds ONNX files with support for dynamic folder names.
     Supports patterns like Conv_testcase_98bd3f/resources/Conv_testcase_98bd3f.onnx
     Returns the most recently created ONNX file.
     """
-    search_path = os.path.join(dir, pattern)
-    files = glob.glob(search_path, recursive=True)
+    if pattern == "**/*.onnx":
+        files = list(_scan_onnx_files(dir))
+    else:
+        search_path = os.path.join(dir, pattern)
+        files = glob.glob(search_path, recursive=True)
     
     if not files:
         raise FileNotFoundError(f"No ONNX file found for pattern '{pattern}' in directory '{dir}'")
@@ -71,6 +98,16 @@ def check_file_exists(path: str) -> bool:
     """
     return os.path.exists(path)
 
+# Templates are passed as strings, so one shared environment without a loader suffices
+_JINJA_ENV = Environment(auto_reload=False)
+
+@functools.lru_cache(maxsize=400)
+def _compile_template(source: str) -> Template:
+    """
+    Compiles a template string once; every step rendering the same string reuses it.
+    """
+    return _JINJA_ENV.from_string(source)
+
 # A registry of safe functions that can be called in post_exec
 POST_EXEC_FUNCTIONS = {
     "find_file": find_file,
@@ -87,8 +124,6 @@ class Executor:
     def __init__(self, tool: Tool, params: Dict[str, Any]):
         self.tool = tool
         self.params = params
-        # Using an empty loader as templates are passed as strings
-        self.jinja_env = Environment()
 
     def _resolve_post_exec(self, work_dir: Path) -> Dict[str, Any]:
         """Resolves the post_exec outputs."""
@@ -114,7 +149,7 @@ class Executor:
                 # Render any jinja variables within the arguments themselves
                 rendered_args = {}
                 for k, v in args.items():
-                    template = self.jinja_env.from_string(v)
+                    template = _compile_template(v)
                     # The params for rendering are the *initial* params for the tool
                     rendered_args[k] = template.render(**self.params)
 
@@ -186,7 +221,7 @@ class Executor:
             for file_pattern in validation.output_files_exist:
                 try:
                     # Render the file pattern with current params
-                    template = self.jinja_env.from_string(file_pattern)
+                    template = _compile_template(file_pattern)
                     rendered_pattern = template.render(**self.params)
                     
                     # Check if file exists (support glob patterns)
@@ -251,6 +286,12 @@ class Executor:
             "details": validation_results
         }
 
+    def render_command(self) -> str:
+        """
+        Renders the tool's command template with this step's params.
+        """
+        return _compile_template(self.tool.command_template).render(**self.params)
+
     def execute(self, work_dir: Path, debug_mode: bool = False) -> Dict[str, Any]:
         """
         Renders the command and executes it in a specific working directory.
@@ -258,8 +299,7 @@ class Executor:
         # Stage 1: 准备执行阶段
         log.info(f"[bold cyan]🔧 准备执行阶段[/bold cyan]")
         
-        template = self.jinja_env.from_string(self.tool.command_template)
-        rendered_command = template.render(**self.params)
+        rendered_command = self.render_command()
 
         log.info(f"  [bold]工具[/bold]: [yellow]{self.tool.name}[/yellow]")
         log.info(f"  [bold]命令[/bold]: [cyan]{rendered_command}[/cyan]")
@@ -61,8 +61,11 @@ log = logging.getLogger("dact")
 
 # Set encoding for file handlers if needed
 def setup_file_logging(log_file_path: str, level: str = "DEBUG"):
-    """Setup file logging with proper UTF-8 encoding."""
-    file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+    """Setup file logging with proper UTF-8 encoding.
+
+    The file is opened on the first emitted record, not when the handler is created.
+    """
+    file_handler = logging.FileHandler(log_file_path, encoding='utf-8', delay=True)
     file_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
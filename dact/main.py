@@ -185,15 +185,24 @@ def list_cases(case_file: str = typer.Argument(..., help="指定一个 .case.yml
         console.print(f"[red]错误: {e}[/red]")
 
 @app.command()
-def gen_py(yaml_case: str = typer.Argument(..., help="输入 .case.yml 文件"),
-           output_py: Optional[str] = typer.Option(None, "--out", "-o", help="输出 pytest .py 文件路径")):
+def gen_py(yaml_case: str = typer.Argument(..., help="输入 .case.yml 文件或包含用例的目录"),
+           output_py: Optional[str] = typer.Option(None, "--out", "-o", help="输出 pytest .py 文件路径（输入为目录时，所有用例合并到该文件）"),
+           force: bool = typer.Option(False, "--force", "-f", help="即使输出文件已是最新也重新生成")):
     """将 YAML 用例转换为独立的 Python 运行脚本，并进行字段合法性检查。"""
     try:
         console.print(f"[bold blue]🔄 YAML 转独立运行脚本[/bold blue]")
         console.print(f"  输入文件: [cyan]{yaml_case}[/cyan]")
         
+        if Path(yaml_case).is_dir():
+            from dact.yaml_converter import convert_directory
+            paths = convert_directory(yaml_case, output_py=output_py, force=force)
+            for path in paths:
+                console.print(f"  输出文件: [cyan]{path}[/cyan]")
+            console.print(f"[bold green]✅ 转换成功，共 {len(paths)} 个文件[/bold green]")
+            return
+
         from dact.yaml_converter import convert_case_yaml_to_py
-        path = convert_case_yaml_to_py(yaml_case, output_py)
+        path = convert_case_yaml_to_py(yaml_case, output_py, force=force)
         
         console.print(f"  输出文件: [cyan]{path}[/cyan]")
         console.print(f"[bold green]✅ 转换成功[/bold green]")
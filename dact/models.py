@@ -1,5 +1,15 @@
+import sys
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+
+def _intern_name(value: Optional[str]) -> Optional[str]:
+    """Intern tool/scenario/step names so repeated dict lookups compare by identity."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _intern_name_list(values: Optional[List[str]]) -> Optional[List[str]]:
+    """Intern each name in a list of step names (e.g. depends_on)."""
+    return [_intern_name(v) for v in values] if values is not None else values
 
 class ToolParameter(BaseModel):
     """A parameter for a tool."""
@@ -38,6 +48,8 @@ class Tool(BaseModel):
     post_exec: Optional[PostExec] = None
     validation: Optional[ToolValidation] = None
 
+    _intern_names = field_validator("name")(_intern_name)
+
 
 class Step(BaseModel):
     """A step in a scenario."""
@@ -51,6 +63,9 @@ class Step(BaseModel):
     continue_on_failure: bool = False       # Continue on failure
     timeout: Optional[int] = None           # Step timeout
 
+    _intern_names = field_validator("name", "tool")(_intern_name)
+    _intern_depends_on = field_validator("depends_on")(_intern_name_list)
+
 class Scenario(BaseModel):
     """A scenario definition."""
     name: str
@@ -62,6 +77,8 @@ class Scenario(BaseModel):
     cleanup_steps: Optional[List[Step]] = None  # Cleanup steps
     validation: Optional[Dict[str, Any]] = None  # Scenario-level validation
 
+    _intern_names = field_validator("name")(_intern_name)
+
 class CaseValidation(BaseModel):
     """A validation check for a case."""
     type: str  # "exit_code", "stdout_contains", "stderr_not_contains", "file_exists", "file_not_exists", 
@@ -93,6 +110,8 @@ class Case(BaseModel):
     timeout: Optional[int] = None  # Case-level timeout
     retry_count: int = 0  # Number of retries on failure
 
+    _intern_names = field_validator("scenario", "tool")(_intern_name)
+
 class DataDrivenCase(BaseModel):
     """A data-driven test case template."""
     template: Case
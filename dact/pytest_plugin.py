@@ -1,22 +1,53 @@
+import functools
+import operator
 import pytest
 import yaml
 import shutil
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from jinja2 import Environment
 from pytest_html import extras as pytest_html_extras
-from dact.models import CaseFile, Scenario, DataDrivenCase
+from dact.models import Case, CaseFile, Scenario, DataDrivenCase
 from dact.tool_loader import load_tools_from_directory
 from dact.scenario_loader import load_scenarios_from_directory
 from dact.executor import Executor
 from dact.dependency_resolver import DependencyResolver
 from dact.validation_engine import ValidationEngine
 from dact.data_providers import load_test_data
+from dact.runner import StepError, _execute_step_layers, _layered_params
 from dact.logger import log
 
 TOOL_DIRECTORY = "tools"
 SCENARIO_DIRECTORY = "scenarios"
 
+_TRANSFORM_CASTS = {"int(": int, "float(": float, "str(": str}
+
+# data_filter operators, e.g. {"batch_size": {"$gt": 10, "$lt": 100}}; unknown operators are ignored
+_FILTER_OPS = {
+    "$gt": operator.gt,
+    "$lt": operator.lt,
+    "$gte": operator.ge,
+    "$lte": operator.le,
+    "$ne": operator.ne,
+    "$in": lambda actual, value: actual in value,
+    "$nin": lambda actual, value: actual not in value,
+}
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_transform(expression: str) -> Tuple:
+    """Parse a data_transform expression once; each data row then only looks values up."""
+    for prefix, cast in _TRANSFORM_CASTS.items():
+        if expression.startswith(prefix):
+            return ("cast", cast, expression[len(prefix):-1])
+    if "+" in expression:
+        parts = expression.split("+")
+        if len(parts) == 2:
+            return ("add", parts[0].strip(), parts[1].strip())
+        return ("skip",)
+    return ("key_or_literal", expression)
+
 def pytest_collect_file(parent, file_path):
     if hasattr(file_path, 'suffix'):  # pathlib.Path
         if file_path.suffix == ".yml" and file_path.name.endswith(".case.yml"):
@@ -47,9 +78,7 @@ class CaseYAMLFile(pytest.File):
         # Collect regular test cases
         for case in case_file.cases:
             # Apply common_params to case params
-            merged_params = case_file.common_params.copy()
-            merged_params.update(case.params)
-            case.params = merged_params
+            case.params = dict(_layered_params(case.params, case_file.common_params))
             
             yield TestCaseItem.from_parent(self, name=case.name, case=case, tools=self.tools, scenarios=self.scenarios)
         
@@ -62,6 +91,13 @@ class CaseYAMLFile(pytest.File):
                 if data_driven_case.data_filter:
                     test_data = self._filter_test_data(test_data, data_driven_case.data_filter)
                 
+                # The template is already validated: grab its fields once
+                # (shallow, so nested CaseValidation models are kept) and build
+                # each row's case without re-running Pydantic validation
+                template_fields = dict(data_driven_case.template)
+                # common_params < template params, merged once for all rows
+                base_params = dict(_layered_params(data_driven_case.template.params, case_file.common_params))
+                
                 for i, data_row in enumerate(test_data):
                     # Apply data transformations if specified
                     if data_driven_case.data_transform:
@@ -73,21 +109,18 @@ class CaseYAMLFile(pytest.File):
                     else:
                         case_name = f"{data_driven_case.template.name}_{i}"
                     
-                    # Create a new case instance for each data row
-                    case = data_driven_case.template.copy(deep=True)
-                    case.name = case_name
-                    
                     # Apply parameter mapping
                     mapped_params = self._apply_parameter_mapping(
                         data_row, 
                         data_driven_case.parameter_mapping
                     )
                     
-                    # Merge with existing params and common_params
-                    final_params = case_file.common_params.copy()
-                    final_params.update(case.params)
-                    final_params.update(mapped_params)
-                    case.params = final_params
+                    # Mapped row values override the merged base params
+                    final_params = {**base_params, **mapped_params}
+                    
+                    case = Case.model_construct(
+                        **{**template_fields, "name": case_name, "params": final_params}
+                    )
                     
                     yield TestCaseItem.from_parent(
                         self, 
@@ -101,8 +134,9 @@ class CaseYAMLFile(pytest.File):
             except Exception as e:
                 log.error(f"Failed to load data-driven test case {data_driven_case.template.name}: {e}")
                 # Create a failing test case to report the error
-                error_case = data_driven_case.template.copy(deep=True)
-                error_case.name = f"{data_driven_case.template.name}_data_load_error"
+                error_case = data_driven_case.template.model_copy(
+                    update={"name": f"{data_driven_case.template.name}_data_load_error"}
+                )
                 yield TestCaseItem.from_parent(
                     self, 
                     name=error_case.name, 
@@ -136,91 +170,57 @@ class CaseYAMLFile(pytest.File):
         
         return mapped_params
     
-    def _filter_test_data(self, test_data: List[dict], filter_criteria: Dict[str, Any]) -> List[dict]:
+    @staticmethod
+    def _filter_test_data(test_data: List[dict], filter_criteria: Dict[str, Any]) -> List[dict]:
         """Filter test data based on criteria."""
-        filtered_data = []
+        # Resolve the criteria once: (key, None, expected) for simple equality,
+        # (key, ((op_func, value), ...), None) for operator filters like {"$gt": 10, "$lt": 100}
+        checks = tuple(
+            (key, tuple((_FILTER_OPS[op], value) for op, value in expected_value.items() if op in _FILTER_OPS), None)
+            if isinstance(expected_value, dict) else (key, None, expected_value)
+            for key, expected_value in filter_criteria.items()
+        )
         
-        for data_row in test_data:
-            include_row = True
-            
-            for key, expected_value in filter_criteria.items():
-                if key not in data_row:
-                    include_row = False
-                    break
-                
-                actual_value = data_row[key]
-                
-                # Support different filter operations
-                if isinstance(expected_value, dict):
-                    # Complex filter operations like {"$gt": 10, "$lt": 100}
-                    for op, value in expected_value.items():
-                        if op == "$gt" and not (actual_value > value):
-                            include_row = False
-                            break
-                        elif op == "$lt" and not (actual_value < value):
-                            include_row = False
-                            break
-                        elif op == "$gte" and not (actual_value >= value):
-                            include_row = False
-                            break
-                        elif op == "$lte" and not (actual_value <= value):
-                            include_row = False
-                            break
-                        elif op == "$ne" and not (actual_value != value):
-                            include_row = False
-                            break
-                        elif op == "$in" and actual_value not in value:
-                            include_row = False
-                            break
-                        elif op == "$nin" and actual_value in value:
-                            include_row = False
-                            break
-                else:
-                    # Simple equality check
+        def row_matches(data_row: dict) -> bool:
+            for key, ops, expected_value in checks:
+                actual_value = data_row.get(key, _MISSING)
+                if actual_value is _MISSING:
+                    return False
+                if ops is None:
                     if actual_value != expected_value:
-                        include_row = False
-                        break
-            
-            if include_row:
-                filtered_data.append(data_row)
+                        return False
+                elif not all(op(actual_value, value) for op, value in ops):
+                    return False
+            return True
         
-        return filtered_data
+        return [data_row for data_row in test_data if row_matches(data_row)]
     
-    def _transform_data_row(self, data_row: dict, transformations: Dict[str, str]) -> dict:
+    @staticmethod
+    def _transform_data_row(data_row: dict, transformations: Dict[str, str]) -> dict:
         """Apply transformations to data row."""
         transformed_row = data_row.copy()
         
         for target_key, expression in transformations.items():
             try:
                 # Simple expression evaluation (can be extended with more complex logic)
-                if expression.startswith("int("):
-                    # Convert to integer: int(source_key)
-                    source_key = expression[4:-1]
-                    if source_key in data_row:
-                        transformed_row[target_key] = int(data_row[source_key])
-                elif expression.startswith("float("):
-                    # Convert to float: float(source_key)
-                    source_key = expression[6:-1]
+                kind, *args = _parse_transform(expression)
+                if kind == "cast":
+                    # Type conversion: int(source_key) / float(source_key) / str(source_key)
+                    cast, source_key = args
                     if source_key in data_row:
-                        transformed_row[target_key] = float(data_row[source_key])
-                elif expression.startswith("str("):
-                    # Convert to string: str(source_key)
-                    source_key = expression[4:-1]
-                    if source_key in data_row:
-                        transformed_row[target_key] = str(data_row[source_key])
-                elif "+" in expression:
+                        transformed_row[target_key] = cast(data_row[source_key])
+                elif kind == "add":
                     # Simple arithmetic: key1 + key2
-                    parts = expression.split("+")
-                    if len(parts) == 2:
-                        key1, key2 = parts[0].strip(), parts[1].strip()
-                        if key1 in data_row and key2 in data_row:
-                            transformed_row[target_key] = data_row[key1] + data_row[key2]
-                elif expression in data_row:
-                    # Simple key mapping
-                    transformed_row[target_key] = data_row[expression]
-                else:
-                    # Literal value
-                    transformed_row[target_key] = expression
+                    key1, key2 = args
+                    if key1 in data_row and key2 in data_row:
+                        transformed_row[target_key] = data_row[key1] + data_row[key2]
+                elif kind == "key_or_literal":
+                    if expression in data_row:
+                        # Simple key mapping
+                        transformed_row[target_key] = data_row[expression]
+                    else:
+                        # Literal value
+                        transformed_row[target_key] = expression
             except Exception as e:
                 log.warning(f"Failed to apply transformation '{expression}' to '{target_key}': {e}")
         
@@ -318,73 +318,57 @@ class TestCaseItem(pytest.Item):
                 
                 run_context = {**merged_context, "steps": {}}
 
-                # Execute steps in dependency order
-                for level in dependency_graph.execution_order:
-                    for step_name in level:
-                        # Find the step definition
-                        step = next((s for s in scenario.steps if s.name == step_name), None)
-                        if not step:
-                            pytest.fail(f"Step '{step_name}' not found in scenario definition.")
-                        
-                        log.info(f"  -> [bold]Step[/bold]: [blue]{step.name}[/blue]")
-                        step_work_dir = case_work_dir / step.name
-                        step_work_dir.mkdir()
+                # Check for debug mode from pytest config
+                debug_mode = self.config.option.capture == 'no'  # -s flag sets capture to 'no'
 
-                        tool = self.tools.get(step.tool)
-                        if not tool:
-                            raise pytest.fail(f"Tool '{step.tool}' not found for step '{step.name}'.")
+                def prepare_step(step, params):
+                    log.info(f"  -> [bold]Step[/bold]: [blue]{step.name}[/blue]")
+                    # Render parameters with current context
+                    return self._render_parameters(params, run_context, jinja_env)
 
-                        # Prepare parameters for rendering
-                        params_to_render = step.params.copy()
-                        
-                        # Apply scenario default params
-                        if scenario.default_params:
-                            for key, value in scenario.default_params.items():
-                                if key not in params_to_render:
-                                    params_to_render[key] = value
-                        
-                        # Apply case-specific step parameters
-                        if self.case.params and step.name in self.case.params:
-                            params_to_render.update(self.case.params[step.name])
+                def run_step(tool, params, step_work_dir):
+                    executor = Executor(tool=tool, params=params)
+                    return executor.execute(work_dir=step_work_dir, debug_mode=debug_mode)
 
-                        # Render parameters with current context
-                        rendered_params = self._render_parameters(params_to_render, run_context, jinja_env)
+                def record_step(step, result, step_work_dir):
+                    # Update run context with step outputs
+                    run_context["steps"][step.name] = {"outputs": result["outputs"]}
+                    
+                    # Update execution summary
+                    execution_summary["steps_count"] += 1
+                    if result.get("validation"):
+                        execution_summary["validation_results"].append({
+                            "step": step.name,
+                            "validation": result["validation"]
+                        })
 
-                        # Check for debug mode from pytest config
-                        debug_mode = self.config.option.capture == 'no'  # -s flag sets capture to 'no'
+                    # Check for step failure
+                    if result["returncode"] != 0:
+                        execution_summary["errors"].append({
+                            "step": step.name,
+                            "exit_code": result["returncode"],
+                            "command": result["command"]
+                        })
                         
-                        executor = Executor(tool=tool, params=rendered_params)
-                        result = executor.execute(work_dir=step_work_dir, debug_mode=debug_mode)
+                        if step.continue_on_failure:
+                            log.warning(f"  Step '{step.name}' failed but continuing due to continue_on_failure=True")
+                        else:
+                            log.error(f"  Step '{step.name}' failed!")
+                            pytest.fail(
+                                f"Step '{step.name}' failed with exit code {result['returncode']}.\n"
+                                f"Command: {result['command']}\n"
+                                f"Logs are in: {step_work_dir}",
+                                pytrace=False
+                            )
 
-                        # Update run context with step outputs
-                        run_context["steps"][step.name] = {"outputs": result["outputs"]}
-                        
-                        # Update execution summary
-                        execution_summary["steps_count"] += 1
-                        if result.get("validation"):
-                            execution_summary["validation_results"].append({
-                                "step": step.name,
-                                "validation": result["validation"]
-                            })
-
-                        # Check for step failure
-                        if result["returncode"] != 0:
-                            execution_summary["errors"].append({
-                                "step": step.name,
-                                "exit_code": result["returncode"],
-                                "command": result["command"]
-                            })
-                            
-                            if step.continue_on_failure:
-                                log.warning(f"  Step '{step.name}' failed but continuing due to continue_on_failure=True")
-                            else:
-                                log.error(f"  Step '{step.name}' failed!")
-                                pytest.fail(
-                                    f"Step '{step.name}' failed with exit code {result['returncode']}.\n"
-                                    f"Command: {result['command']}\n"
-                                    f"Logs are in: {step_work_dir}",
-                                    pytrace=False
-                                )
+                # Execute steps in dependency order; independent steps of a layer run in parallel
+                try:
+                    _execute_step_layers(
+                        scenario, dependency_graph.execution_order, self.tools, self.case.params,
+                        case_work_dir, prepare_step, run_step, record_step, parallel=not debug_mode
+                    )
+                except StepError as e:
+                    pytest.fail(str(e), pytrace=False)
                 
                 # Execute case-level validations after scenario completion
                 if self.case.validation:
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import os
 import sys
 import shutil
+import threading
+import uuid
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
+import yaml
 from jinja2 import Environment
+from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from dact.logger import console, log
-from dact.models import CaseFile, Case, CaseValidation
+from dact.models import CaseFile, Case, CaseValidation, Scenario, Step, Tool
 from dact.tool_loader import load_tools_from_directory
 from dact.scenario_loader import load_scenarios_from_directory
 from dact.dependency_resolver import DependencyResolver
 from dact.validation_engine import ValidationEngine
 from dact.executor import Executor
+from dact.data_providers import load_test_data
 
 
 class CaseRunResult:
@@ -24,7 +33,16 @@ class CaseRunResult:
         self.errors = errors or []
 
 
-def _render_parameters(params: dict, context: dict, jinja_env: Environment) -> dict:
+def _layered_params(*layers: Optional[Mapping[str, Any]]) -> ChainMap:
+    """
+    按优先级从高到低叠加参数层，例如 (步骤参数, 用例参数, 公共参数)。
+
+    只做顶层键查找、不复制任何一层，嵌套字典整体覆盖；空层跳过。
+    """
+    return ChainMap(*(layer for layer in layers if layer))
+
+
+def _render_parameters(params: Mapping[str, Any], context: dict, jinja_env: Environment) -> dict:
     rendered_params: Dict[str, Any] = {}
     for key, value in params.items():
         if isinstance(value, str):
@@ -67,24 +85,129 @@ def _find_project_root(start: Path) -> Path:
         current = current.parent
 
 
-def run_case(case: Case, project_root: Path, debug: bool = False) -> CaseRunResult:
-    repo_root = _find_project_root(project_root)
+def _reset_work_dir(work_dir: Path) -> None:
+    """
+    清空并重建用例工作目录。
 
-    work_dir = repo_root / "dact_outputs" / case.name
+    空目录直接复用；非空目录先原子重命名为 ``<name>.trash-<uuid>``，再由后台线程删除，
+    避免 rmtree 阻塞用例启动。线程为非守护线程，进程退出前会等待删除完成；
+    进程中途退出时遗留的 ``*.trash-*`` 目录也由该线程一并清理。
+    """
     if work_dir.exists():
-        shutil.rmtree(work_dir)
+        if not any(work_dir.iterdir()):
+            return
+        trash_dir = work_dir.with_name(f"{work_dir.name}.trash-{uuid.uuid4().hex}")
+        os.rename(work_dir, trash_dir)
+        threading.Thread(target=_remove_trash_dirs, args=(trash_dir.parent,)).start()
     work_dir.mkdir(parents=True)
 
-    _log_section(f"用例 {case.name}")
-    log.info(f"[bold]用例名称[/bold]: [yellow]{case.name}[/yellow]")
-    if case.description:
-        log.info(f"[bold]描述[/bold]: {case.description}")
 
+def _remove_trash_dirs(parent: Path) -> None:
+    """删除 parent 下所有 ``*.trash-*`` 目录（本次及此前遗留的）；并发删除同一目录时忽略错误。"""
+    for trash_dir in parent.glob("*.trash-*"):
+        shutil.rmtree(trash_dir, ignore_errors=True)
+
+
+Catalog = Tuple[Dict[str, Tool], Dict[str, Scenario]]
+
+# 同一执行层中并行运行的最大步骤数
+MAX_PARALLEL_STEPS = 8
+
+
+def load_catalog(project_root: Path) -> Catalog:
+    """加载项目中的工具与场景（含 examples 中的场景），供多个用例共用。"""
+    repo_root = _find_project_root(project_root)
     tools = load_tools_from_directory(str(repo_root / "tools"))
     scenarios = load_scenarios_from_directory(str(repo_root / "scenarios"))
     # 同时加载 examples 中的场景（兼容）
     examples = load_scenarios_from_directory(str(repo_root / "examples" / "scenarios"))
-    scenarios = {**scenarios, **examples}
+    return tools, {**scenarios, **examples}
+
+
+@contextmanager
+def _step_task(progress: Optional[Progress], description: str):
+    """在共享的 Progress 中为当前步骤添加一个任务；未提供 Progress 时不显示动画。"""
+    if progress is None:
+        yield
+        return
+    task_id = progress.add_task(description, total=None)
+    try:
+        yield
+    finally:
+        progress.remove_task(task_id)
+
+
+class StepError(Exception):
+    """场景步骤无法执行或执行失败；errors 为逐行的错误信息。"""
+
+    def __init__(self, *errors: str):
+        super().__init__("\n".join(errors))
+        self.errors = list(errors)
+
+
+def _run_step(tool: Tool, params: dict, step_dir: Path, debug: bool = False,
+              progress: Optional[Progress] = None) -> dict:
+    with _step_task(progress, f"正在执行: {tool.name}"):
+        return Executor(tool=tool, params=params).execute(step_dir, debug_mode=debug)
+
+
+def _execute_step_layers(scenario: Scenario, execution_order: List[List[str]], tools: Dict[str, Tool],
+                         case_params: Optional[dict], work_dir: Path,
+                         prepare: Callable[[Step, Mapping[str, Any]], dict],
+                         run: Callable[[Tool, dict, Path], dict],
+                         record: Callable[[Step, dict, Path], None],
+                         parallel: bool = True) -> None:
+    """
+    按依赖层执行场景步骤，run_case 与 pytest 插件共用。
+
+    每层先在主线程中按顺序准备所有步骤（参数只依赖之前各层的输出），
+    prepare(step, params) 渲染按“场景默认 -> 步骤定义 -> 用例覆盖”组装的参数。
+    parallel 为真且本层有多个步骤时，run 在线程池中并行执行（外部命令在子进程中运行），
+    整层执行完后再按步骤顺序 record；否则逐个执行并记录，日志不交错。
+    步骤或工具未定义时抛出 StepError；record 抛出异常即中止后续步骤。
+    """
+    # 步骤名 -> 步骤（reversed 使重名时取第一个，与顺序查找一致）
+    steps_by_name = {s.name: s for s in reversed(scenario.steps)}
+
+    for level in execution_order:
+        prepared = []
+        for step_name in level:
+            step = steps_by_name.get(step_name)
+            if not step:
+                raise StepError(f"Step '{step_name}' not found in scenario '{scenario.name}'.")
+            tool = tools.get(step.tool)
+            if not tool:
+                raise StepError(f"Tool '{step.tool}' not found for step '{step.name}'.")
+            step_dir = work_dir / step.name
+            step_dir.mkdir(exist_ok=True)
+
+            params = _layered_params((case_params or {}).get(step.name), step.params, scenario.default_params)
+            prepared.append((step, tool, step_dir, prepare(step, params)))
+
+        if len(prepared) > 1 and parallel:
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_STEPS, len(prepared))) as pool:
+                results = list(pool.map(lambda p: run(p[1], p[3], p[2]), prepared))
+            for (step, _, step_dir, _), result in zip(prepared, results):
+                record(step, result, step_dir)
+        else:
+            for step, tool, step_dir, params in prepared:
+                record(step, run(tool, params, step_dir), step_dir)
+
+
+def run_case(case: Case, project_root: Path, debug: bool = False, progress: Optional[Progress] = None,
+             catalog: Optional[Catalog] = None) -> CaseRunResult:
+    repo_root = _find_project_root(project_root)
+
+    work_dir = repo_root / "dact_outputs" / case.name
+    _reset_work_dir(work_dir)
+
+    _log_section(f"用例 {case.name}")
+    log.info(f"[bold]用例名称[/bold]: [yellow]{case.name}[/yellow]")
+    if case.description:
+        log.info(f"[bold]描述[/bold]: {case.description}")
+
+    # 未传入时单独加载；批量运行时由调用方加载一次后共用
+    tools, scenarios = catalog if catalog is not None else load_catalog(repo_root)
 
     validation_engine = ValidationEngine()
     jinja_env = Environment()
@@ -111,42 +234,30 @@ def run_case(case: Case, project_root: Path, debug: bool = False) -> CaseRunResu
             if case.params:
                 run_context.update(case.params)
 
-            # 执行步骤（含动态执行动画）
-            for level in graph.execution_order:
-                for step_name in level:
-                    step = next((s for s in scenario.steps if s.name == step_name), None)
-                    if not step:
-                        return CaseRunResult(case.name, False, work_dir, [f"Step '{step_name}' not found in scenario '{scenario.name}'."])
-
-                    _log_section(f"步骤 {step.name}")
-                    step_dir = work_dir / step.name
-                    step_dir.mkdir(exist_ok=True)
-
-                    tool = tools.get(step.tool)
-                    if not tool:
-                        return CaseRunResult(case.name, False, work_dir, [f"Tool '{step.tool}' not found for step '{step.name}'."])
-
-                    # 组装参数（场景默认 -> 步骤定义 -> 用例覆盖）
-                    params = step.params.copy()
-                    if scenario.default_params:
-                        for k, v in scenario.default_params.items():
-                            if k not in params:
-                                params[k] = v
-                    if case.params and step.name in case.params:
-                        params.update(case.params[step.name])
-
-                    rendered_params = _render_parameters(params, run_context, jinja_env)
-
-                    with console.status(f"正在执行: {tool.name}", spinner="dots"):
-                        result = Executor(tool=tool, params=rendered_params).execute(step_dir, debug_mode=debug)
-
-                    run_context["steps"][step.name] = {"outputs": result["outputs"]}
-
-                    if result["returncode"] != 0 and not getattr(step, "continue_on_failure", False):
-                        return CaseRunResult(case.name, False, work_dir, [
-                            f"Step '{step.name}' failed with exit code {result['returncode']}.",
-                            f"Command: {result['command']}"
-                        ])
+            def _prepare_step(step, params):
+                _log_section(f"步骤 {step.name}")
+                return _render_parameters(params, run_context, jinja_env)
+
+            def _record_step(step, result, step_dir):
+                run_context["steps"][step.name] = {"outputs": result["outputs"]}
+
+                if result["returncode"] != 0 and not getattr(step, "continue_on_failure", False):
+                    raise StepError(
+                        f"Step '{step.name}' failed with exit code {result['returncode']}.",
+                        f"Command: {result['command']}"
+                    )
+
+            # 执行步骤（含动态执行动画）；调试模式下顺序执行，日志不交错
+            try:
+                _execute_step_layers(
+                    scenario, graph.execution_order, tools, case.params, work_dir,
+                    _prepare_step,
+                    lambda tool, params, step_dir: _run_step(tool, params, step_dir, debug, progress),
+                    _record_step,
+                    parallel=not debug,
+                )
+            except StepError as e:
+                return CaseRunResult(case.name, False, work_dir, e.errors)
 
             # 用例级校验
             if case.validation:
@@ -167,8 +278,7 @@ def run_case(case: Case, project_root: Path, debug: bool = False) -> CaseRunResu
                 return CaseRunResult(case.name, False, work_dir, [f"Tool '{case.tool}' not found."])
 
             params = case.params or {}
-            with console.status(f"正在执行: {tool.name}", spinner="dots"):
-                result = Executor(tool=tool, params=params).execute(work_dir, debug_mode=debug)
+            result = _run_step(tool, params, work_dir, debug, progress)
 
             if case.validation:
                 log.info("[bold]用例校验[/bold]…")
@@ -198,77 +308,96 @@ def run_case_file(case_file_path: str, debug: bool = False) -> Tuple[List[CaseRu
         raise FileNotFoundError(f"{case_file_path} 不存在")
 
     raw = case_file.read_text(encoding="utf-8")
-    import yaml  # lazy import
     data = yaml.safe_load(raw)
     case_file_obj = CaseFile(**data)
 
     project_root = case_file.resolve().parent
+    catalog = load_catalog(project_root)
     results: List[CaseRunResult] = []
 
-    # 普通用例
-    for case in case_file_obj.cases:
-        # 合并 common_params
-        if case_file_obj.common_params:
-            merged = dict(case_file_obj.common_params)
-            merged.update(case.params)
-            case.params = merged
-        results.append(run_case(case, project_root, debug))
-
-    # 数据驱动用例
-    for dd in case_file_obj.data_driven_cases:
-        from dact.data_providers import load_test_data
-        try:
-            test_rows = load_test_data(dd.data_source)
-            # 过滤
-            if dd.data_filter:
-                # 简易过滤：仅支持等值
-                filt = dd.data_filter
-                filtered = []
-                for row in test_rows:
-                    ok = True
-                    for k, v in filt.items():
-                        if row.get(k) != v:
-                            ok = False
-                            break
-                    if ok:
-                        filtered.append(row)
-                test_rows = filtered
-        except Exception as e:
-            # 将数据加载错误作为一个失败用例
-            case = dd.template.copy(deep=True)
-            case.name = f"{dd.template.name}_data_load_error"
-            results.append(CaseRunResult(case.name, False, project_root / "dact_outputs" / case.name, [f"Data loading failed: {e}"]))
-            continue
-
-        for i, row in enumerate(test_rows):
-            case = dd.template.copy(deep=True)
-            case.name = dd.name_template or f"{dd.template.name}_{i}"
-
-            # 参数映射
-            mapped: Dict[str, Any] = {}
-            if dd.parameter_mapping:
-                for param_path, data_key in dd.parameter_mapping.items():
+    # 所有步骤共用一个 Progress 实例，避免每个步骤单独启动 console.status 渲染线程
+    progress = Progress(SpinnerColumn(), TextColumn("{task.description}"), console=console, transient=True)
+    with progress:
+        # 普通用例
+        for case in case_file_obj.cases:
+            # 合并 common_params
+            if case_file_obj.common_params:
+                case.params = dict(_layered_params(case.params, case_file_obj.common_params))
+            results.append(run_case(case, project_root, debug, progress=progress, catalog=catalog))
+
+        # 数据驱动用例
+        for dd in case_file_obj.data_driven_cases:
+            try:
+                test_rows = load_test_data(dd.data_source)
+                # 过滤
+                if dd.data_filter:
+                    # 简易过滤：仅支持等值
+                    filt = dd.data_filter
+                    filtered = []
+                    for row in test_rows:
+                        ok = True
+                        for k, v in filt.items():
+                            if row.get(k) != v:
+                                ok = False
+                                break
+                        if ok:
+                            filtered.append(row)
+                    test_rows = filtered
+            except Exception as e:
+                # 将数据加载错误作为一个失败用例
+                error_name = f"{dd.template.name}_data_load_error"
+                results.append(CaseRunResult(error_name, False, project_root / "dact_outputs" / error_name, [f"Data loading failed: {e}"]))
+                continue
+
+            # 模板字段只取一次（浅层，保留嵌套的 CaseValidation 模型），逐行仅替换 name 与 params
+            template_fields = dict(dd.template)
+
+            # 参数路径只需拆分一次，所有数据行共用
+            compiled_mapping = [
+                (tuple(param_path.split(".")), data_key)
+                for param_path, data_key in (dd.parameter_mapping or {}).items()
+            ]
+
+            for i, row in enumerate(test_rows):
+                # 参数映射
+                mapped: Dict[str, Any] = {}
+                for parts, data_key in compiled_mapping:
                     if data_key in row:
-                        if "." in param_path:
-                            parts = param_path.split(".")
-                            current = mapped
-                            for part in parts[:-1]:
-                                current = current.setdefault(part, {})
-                            current[parts[-1]] = row[data_key]
-                        else:
-                            mapped[param_path] = row[data_key]
-            # 合并到 case.params + common_params
-            merged = dict(case_file_obj.common_params)
-            merged.update(case.params)
-            merged.update(mapped)
-            case.params = merged
-
-            results.append(run_case(case, project_root, debug))
+                        current = mapped
+                        for part in parts[:-1]:
+                            current = current.setdefault(part, {})
+                        current[parts[-1]] = row[data_key]
+                # 合并到 case.params + common_params
+                merged = dict(_layered_params(mapped, dd.template.params, case_file_obj.common_params))
+
+                # 模板已校验过，直接构造，跳过逐行的 Pydantic 校验
+                case = Case.model_construct(**{
+                    **template_fields,
+                    "name": dd.name_template or f"{dd.template.name}_{i}",
+                    "params": merged,
+                })
+
+                results.append(run_case(case, project_root, debug, progress=progress, catalog=catalog))
 
     failures = [r for r in results if not r.success]
     return results, (0 if not failures else 1)
 
 
+# 目录扫描时跳过的目录（隐藏目录另行判断）
+_SKIP_DIRS = {"dact_outputs", "__pycache__", "node_modules"}
+
+
+def _discover_case_files(root: Path) -> List[Path]:
+    """递归查找 .case.yml 文件，跳过隐藏目录与输出/缓存目录。"""
+    case_files: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in _SKIP_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith(".case.yml"):
+                case_files.append(Path(dirpath) / filename)
+    return case_files
+
+
 def run(target: Optional[str] = None, debug: bool = False, verbose: bool = False) -> int:
     """
     运行指定的用例文件或目录。返回退出码（0 成功，1 失败）。
@@ -285,7 +414,7 @@ def run(target: Optional[str] = None, debug: bool = False, verbose: bool = False
     case_files: List[Path] = []
 
     if path.is_dir():
-        case_files = list(path.glob("**/*.case.yml"))
+        case_files = _discover_case_files(path)
         if not case_files:
             console.print(f"[yellow]目录中未找到任何 .case.yml 文件: {path}[/yellow]")
             return 0
@@ -1,7 +1,7 @@
-import yaml
 from pathlib import Path
 from typing import Dict
 from dact.models import Scenario
+from dact.yaml_utils import load_yaml
 
 def load_scenarios_from_directory(directory: str) -> Dict[str, Scenario]:
     """
@@ -14,8 +14,8 @@ def load_scenarios_from_directory(directory: str) -> Dict[str, Scenario]:
         return scenarios
 
     for scenario_file in scenario_dir.glob("*.scenario.yml"):
-        with open(scenario_file, 'r') as f:
-            scenario_data = yaml.safe_load(f)
+        with open(scenario_file, 'rb') as f:
+            scenario_data = load_yaml(f)
             if scenario_data:
                 scenario = Scenario(**scenario_data)
                 if scenario.name in scenarios:
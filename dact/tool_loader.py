@@ -1,7 +1,7 @@
-import yaml
 from pathlib import Path
 from typing import Dict
 from dact.models import Tool
+from dact.yaml_utils import load_yaml
 
 class ToolLoader:
     """
@@ -20,8 +20,8 @@ class ToolLoader:
             return {}
 
         for tool_file in self.tool_directory.glob("*.tool.yml"):
-            with open(tool_file, 'r') as f:
-                tool_data = yaml.safe_load(f)
+            with open(tool_file, 'rb') as f:
+                tool_data = load_yaml(f)
                 if tool_data:
                     tool = Tool(**tool_data)
                     if tool.name in self._tools:
@@ -8,16 +8,38 @@ This module provides a centralized registry for tools with support for:
 - Enhanced error handling and reporting
 """
 
+import asyncio
+import bisect
+import functools
+import re
 import subprocess
+import sys
 import shutil
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 from dact.models import Tool
 
+try:
+    from packaging import version as pkg_version
+except ImportError:
+    pkg_version = None
+
+# Upper bound on concurrent version-check subprocesses
+_MAX_VERSION_CHECK_WORKERS = 16
+
+# dataclass(slots=True) needs Python 3.10; on 3.9 the result dataclasses keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Lines mentioning "version" and the dotted version number on them
+_VERSION_WORD_RE = re.compile(r'version', re.IGNORECASE)
+_VERSION_NUMBER_RE = re.compile(r'(\d+\.\d+(?:\.\d+)?)')
+
 
 class ToolType(Enum):
     """Types of tools supported by the registry."""
@@ -26,17 +48,21 @@ class ToolType(Enum):
     MOCK = "mock"
 
 
-@dataclass
+# Enum's own value -> member dict, for O(1) lookup of a tool's declared type
+_TOOLTYPE_VALUES = ToolType._value2member_map_
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ToolInfo:
     """Brief information about a tool for listing purposes."""
     name: str
     type: ToolType
     description: Optional[str]
-    available: bool
+    available: Optional[bool]  # None when listed without an availability check
     version: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ToolDetails:
     """Detailed information about a tool."""
     name: str
@@ -50,7 +76,7 @@ class ToolDetails:
     error_message: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ToolAvailability:
     """Tool availability status information."""
     name: str
@@ -69,10 +95,15 @@ class RealToolAdapter(ABC):
     version validation, and parameter mapping.
     """
     
-    def __init__(self, name: str, executable_name: str):
+    def __init__(self, name: str, executable_name: str, ttl_seconds: float = 60.0,
+                 timeout_seconds: float = 2.0):
         self.name = name
         self.executable_name = executable_name
-        self._cached_availability: Optional[ToolAvailability] = None
+        self.ttl_seconds = ttl_seconds
+        # A well-behaved --version answers in well under a second; don't wait long on a hung one
+        self.timeout_seconds = timeout_seconds
+        # (availability, time.monotonic() at which it was computed, registry generation)
+        self._cached: Optional[Tuple[ToolAvailability, float, Optional[int]]] = None
     
     @property
     @abstractmethod
@@ -100,103 +131,178 @@ class RealToolAdapter(ABC):
         """Find the executable path for this tool."""
         return shutil.which(self.executable_name)
     
-    def check_availability(self, force_refresh: bool = False) -> ToolAvailability:
+    def check_availability(self, force_refresh: bool = False,
+                           generation: Optional[int] = None) -> ToolAvailability:
         """
         Check if the tool is available and get version information.
         
+        Results are cached for ``ttl_seconds`` (measured with a monotonic clock).
+        
         Args:
             force_refresh: If True, bypass cache and check again
+            generation: Cache generation of the calling registry. A cached result
+                stored under a different generation is treated as stale.
             
         Returns:
             ToolAvailability object with status information
         """
-        if self._cached_availability and not force_refresh:
-            return self._cached_availability
+        cached = self._fresh_cached(force_refresh, generation)
+        if cached is not None:
+            return cached
+        
+        availability = self._probe_availability()
+        self._cached = (availability, time.monotonic(), generation)
+        return availability
+    
+    async def check_availability_async(self, force_refresh: bool = False,
+                                       generation: Optional[int] = None) -> ToolAvailability:
+        """
+        Asyncio variant of check_availability.
         
+        The version check runs through asyncio.create_subprocess_exec, so many adapters
+        can be checked from one event loop thread (see ToolRegistry.refresh_all_async).
+        Shares the cache with check_availability.
+        """
+        cached = self._fresh_cached(force_refresh, generation)
+        if cached is not None:
+            return cached
+        
+        availability = await self._probe_availability_async()
+        self._cached = (availability, time.monotonic(), generation)
+        return availability
+    
+    def _fresh_cached(self, force_refresh: bool, generation: Optional[int]) -> Optional[ToolAvailability]:
+        """Return the cached availability if still valid for generation, else None."""
+        if self._cached and not force_refresh:
+            availability, cached_at, cached_generation = self._cached
+            if ((generation is None or cached_generation == generation)
+                    and time.monotonic() - cached_at < self.ttl_seconds):
+                return availability
+        return None
+    
+    def _probe_availability(self) -> ToolAvailability:
+        """Locate the executable and run the version check, bypassing any cache."""
         executable_path = self.find_executable()
         if not executable_path:
-            self._cached_availability = ToolAvailability(
-                name=self.name,
-                available=False,
-                error_message=f"Executable '{self.executable_name}' not found in PATH"
-            )
-            return self._cached_availability
+            return self._not_found()
         
         try:
-            # Check version
-            result = subprocess.run(
-                self.version_check_command,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                version = self._extract_version(result.stdout)
-                if self._is_version_compatible(version):
-                    self._cached_availability = ToolAvailability(
-                        name=self.name,
-                        available=True,
-                        version=version,
-                        path=executable_path
-                    )
-                else:
-                    self._cached_availability = ToolAvailability(
-                        name=self.name,
-                        available=False,
-                        version=version,
-                        path=executable_path,
-                        error_message=f"Version {version} is not compatible. Minimum required: {self.minimum_version}"
-                    )
-            else:
-                self._cached_availability = ToolAvailability(
-                    name=self.name,
-                    available=False,
-                    path=executable_path,
-                    error_message=f"Version check failed: {result.stderr}"
-                )
-                
+            result = self._run_version_check(executable_path)
         except subprocess.TimeoutExpired:
-            self._cached_availability = ToolAvailability(
-                name=self.name,
-                available=False,
-                path=executable_path,
-                error_message="Version check timed out"
+            return self._check_failed(executable_path, "Version check timed out")
+        except Exception as e:
+            return self._check_failed(executable_path, f"Version check failed: {str(e)}")
+        return self._availability_from_output(executable_path, result.returncode,
+                                              result.stdout, result.stderr)
+    
+    async def _probe_availability_async(self) -> ToolAvailability:
+        """Asyncio counterpart of _probe_availability."""
+        executable_path = self.find_executable()
+        if not executable_path:
+            return self._not_found()
+        
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self._version_argv(executable_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout_seconds)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return self._check_failed(executable_path, "Version check timed out")
         except Exception as e:
-            self._cached_availability = ToolAvailability(
+            return self._check_failed(executable_path, f"Version check failed: {str(e)}")
+        return self._availability_from_output(
+            executable_path, proc.returncode,
+            stdout.decode(errors="replace"), stderr.decode(errors="replace")
+        )
+    
+    def _not_found(self) -> ToolAvailability:
+        return ToolAvailability(
+            name=self.name,
+            available=False,
+            error_message=f"Executable '{self.executable_name}' not found in PATH"
+        )
+    
+    def _check_failed(self, executable_path: str, error_message: str) -> ToolAvailability:
+        return ToolAvailability(
+            name=self.name,
+            available=False,
+            path=executable_path,
+            error_message=error_message
+        )
+    
+    def _availability_from_output(self, executable_path: str, returncode: int,
+                                  stdout: str, stderr: str) -> ToolAvailability:
+        """Build the availability result from a finished version-check command."""
+        if returncode != 0:
+            return self._check_failed(executable_path, f"Version check failed: {stderr}")
+        
+        version = self._extract_version(stdout)
+        if self._is_version_compatible(version):
+            return ToolAvailability(
                 name=self.name,
-                available=False,
-                path=executable_path,
-                error_message=f"Version check failed: {str(e)}"
+                available=True,
+                version=version,
+                path=executable_path
             )
-        
-        return self._cached_availability
+        return ToolAvailability(
+            name=self.name,
+            available=False,
+            version=version,
+            path=executable_path,
+            error_message=f"Version {version} is not compatible. Minimum required: {self.minimum_version}"
+        )
+    
+    def _version_argv(self, executable_path: str) -> List[str]:
+        """
+        version_check_command with a bare executable name replaced by the path already
+        resolved by find_executable, so the exec does not search PATH a second time.
+        """
+        command = list(self.version_check_command)
+        if command and command[0] == self.executable_name:
+            command[0] = executable_path
+        return command
+    
+    def _run_version_check(self, executable_path: str) -> subprocess.CompletedProcess:
+        """Run the version check command and capture its output."""
+        return subprocess.run(
+            self._version_argv(executable_path),
+            capture_output=True,
+            text=True,
+            timeout=self.timeout_seconds
+        )
     
     def _extract_version(self, version_output: str) -> Optional[str]:
         """Extract version string from command output."""
         # Default implementation - can be overridden by subclasses
-        lines = version_output.strip().split('\n')
-        for line in lines:
-            if 'version' in line.lower():
+        for line in version_output.splitlines():
+            if _VERSION_WORD_RE.search(line):
                 # Try to extract version number
-                import re
-                version_match = re.search(r'(\d+\.\d+(?:\.\d+)?)', line)
+                version_match = _VERSION_NUMBER_RE.search(line)
                 if version_match:
                     return version_match.group(1)
         return None
     
+    @functools.cached_property
+    def _parsed_minimum_version(self):
+        """minimum_version parsed once with packaging, or None if unavailable."""
+        if pkg_version is None or not self.minimum_version:
+            return None
+        return pkg_version.parse(self.minimum_version)
+    
     def _is_version_compatible(self, version: Optional[str]) -> bool:
         """Check if the detected version is compatible."""
         if not version or not self.minimum_version:
             return True
         
-        try:
-            from packaging import version as pkg_version
-            return pkg_version.parse(version) >= pkg_version.parse(self.minimum_version)
-        except ImportError:
+        if pkg_version is None:
             # Fallback to simple string comparison if packaging is not available
             return version >= self.minimum_version
+        return pkg_version.parse(version) >= self._parsed_minimum_version
 
 
 class ToolRegistry:
@@ -210,10 +316,20 @@ class ToolRegistry:
     - Integration with both YAML-defined and real tools
     """
     
-    def __init__(self):
+    def __init__(self, availability_ttl: float = 60.0):
         self._tools: Dict[str, Tool] = {}
         self._real_tool_adapters: Dict[str, RealToolAdapter] = {}
-        self._tool_availability_cache: Dict[str, ToolAvailability] = {}
+        self.availability_ttl = availability_ttl
+        # Bumped to invalidate every cached availability (ours and the adapters') at once
+        self._generation = 0
+        # name -> (availability, time.monotonic() at which it was cached, generation)
+        self._tool_availability_cache: Dict[str, Tuple[ToolAvailability, float, int]] = {}
+        # (generation, time.monotonic(), (available names, unavailable names))
+        self._partition_cache: Optional[Tuple[int, float, Tuple[List[str], List[str]]]] = None
+        # name -> (parameters as dicts, validation rules as dict), built once at registration
+        self._details_cache: Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = {}
+        # Names of all YAML tools and adapters, kept sorted so list_tools needn't sort
+        self._sorted_names: List[str] = []
     
     def register_tool(self, tool: Tool) -> None:
         """
@@ -228,10 +344,16 @@ class ToolRegistry:
         if tool.name in self._tools:
             raise ValueError(f"Tool '{tool.name}' is already registered")
         
+        self._add_sorted_name(tool.name)
         self._tools[tool.name] = tool
+        self._details_cache[tool.name] = (
+            {param_name: param.dict() for param_name, param in tool.parameters.items()},
+            tool.validation.dict() if tool.validation else None,
+        )
         # Clear availability cache for this tool
         if tool.name in self._tool_availability_cache:
             del self._tool_availability_cache[tool.name]
+        self._partition_cache = None
     
     def register_real_tool_adapter(self, adapter: RealToolAdapter) -> None:
         """
@@ -240,10 +362,17 @@ class ToolRegistry:
         Args:
             adapter: RealToolAdapter instance to register
         """
+        self._add_sorted_name(adapter.name)
         self._real_tool_adapters[adapter.name] = adapter
         # Clear availability cache for this tool
         if adapter.name in self._tool_availability_cache:
             del self._tool_availability_cache[adapter.name]
+        self._partition_cache = None
+    
+    def _add_sorted_name(self, name: str) -> None:
+        """Insert name into _sorted_names unless a tool or adapter already uses it."""
+        if name not in self._tools and name not in self._real_tool_adapters:
+            bisect.insort(self._sorted_names, name)
     
     def get_tool(self, name: str) -> Optional[Tool]:
         """
@@ -269,39 +398,50 @@ class ToolRegistry:
         """
         return self._real_tool_adapters.get(name)
     
-    def list_tools(self) -> List[ToolInfo]:
+    def list_tools(self, include_availability: bool = True) -> List[ToolInfo]:
         """
         List all registered tools with brief information.
         
+        Args:
+            include_availability: If False, skip availability/version checks (no
+                subprocesses are spawned) and report ``available``/``version`` as None
+        
         Returns:
             List of ToolInfo objects
         """
+        if include_availability:
+            self._warm_adapter_availability()
         tool_infos = []
         
-        # Add YAML-defined tools
-        for tool in self._tools.values():
-            availability = self.validate_tool_availability(tool.name)
-            tool_infos.append(ToolInfo(
-                name=tool.name,
-                type=ToolType(tool.type) if tool.type in [t.value for t in ToolType] else ToolType.SHELL,
-                description=tool.description,
-                available=availability.available,
-                version=availability.version
-            ))
-        
-        # Add real tool adapters that aren't already in YAML tools
-        for adapter in self._real_tool_adapters.values():
-            if adapter.name not in self._tools:
-                availability = adapter.check_availability()
+        # Names are kept sorted at registration; a YAML tool shadows an adapter of the same name
+        for name in self._sorted_names:
+            available, version = self._listing_availability(name, include_availability)
+            tool = self._tools.get(name)
+            if tool is not None:
+                tool_infos.append(ToolInfo(
+                    name=tool.name,
+                    type=_TOOLTYPE_VALUES.get(tool.type, ToolType.SHELL),
+                    description=tool.description,
+                    available=available,
+                    version=version
+                ))
+            else:
                 tool_infos.append(ToolInfo(
-                    name=adapter.name,
+                    name=name,
                     type=ToolType.REAL,
-                    description=f"Real tool adapter for {adapter.name}",
-                    available=availability.available,
-                    version=availability.version
+                    description=f"Real tool adapter for {name}",
+                    available=available,
+                    version=version
                 ))
         
-        return sorted(tool_infos, key=lambda x: x.name)
+        return tool_infos
+    
+    def _listing_availability(self, name: str, include_availability: bool) -> Tuple[Optional[bool], Optional[str]]:
+        """(available, version) for a list_tools entry, or (None, None) when not requested."""
+        if not include_availability:
+            return None, None
+        availability = self.validate_tool_availability(name)
+        return availability.available, availability.version
     
     def get_tool_details(self, name: str) -> Optional[ToolDetails]:
         """
@@ -317,15 +457,16 @@ class ToolRegistry:
         tool = self._tools.get(name)
         if tool:
             availability = self.validate_tool_availability(name)
+            parameters, validation_rules = self._details_cache[name]
             return ToolDetails(
                 name=tool.name,
-                type=ToolType(tool.type) if tool.type in [t.value for t in ToolType] else ToolType.SHELL,
+                type=_TOOLTYPE_VALUES.get(tool.type, ToolType.SHELL),
                 description=tool.description,
                 available=availability.available,
                 version=availability.version,
                 executable_path=availability.path,
-                parameters={param_name: param.dict() for param_name, param in tool.parameters.items()},
-                validation_rules=tool.validation.dict() if tool.validation else None,
+                parameters=parameters,
+                validation_rules=validation_rules,
                 error_message=availability.error_message
             )
         
@@ -358,14 +499,17 @@ class ToolRegistry:
         Returns:
             ToolAvailability object with validation results
         """
-        if not force_refresh and name in self._tool_availability_cache:
-            return self._tool_availability_cache[name]
+        if not force_refresh:
+            # Hot path: one dict probe, then the generation/TTL check
+            entry = self._tool_availability_cache.get(name)
+            if entry is not None and self._entry_is_fresh(entry):
+                return entry[0]
         
         # Check real tool adapters first
         adapter = self._real_tool_adapters.get(name)
         if adapter:
-            availability = adapter.check_availability(force_refresh)
-            self._tool_availability_cache[name] = availability
+            availability = adapter.check_availability(force_refresh, generation=self._generation)
+            self._tool_availability_cache[name] = (availability, time.monotonic(), self._generation)
             return availability
         
         # Check YAML-defined tools
@@ -378,7 +522,7 @@ class ToolRegistry:
                 version=None,
                 path=None
             )
-            self._tool_availability_cache[name] = availability
+            self._tool_availability_cache[name] = (availability, time.monotonic(), self._generation)
             return availability
         
         # Tool not found
@@ -387,15 +531,83 @@ class ToolRegistry:
             available=False,
             error_message=f"Tool '{name}' is not registered"
         )
-        self._tool_availability_cache[name] = availability
+        self._tool_availability_cache[name] = (availability, time.monotonic(), self._generation)
         return availability
     
+    def _entry_is_fresh(self, entry: Tuple[ToolAvailability, float, int]) -> bool:
+        """Whether a cache entry is from the current generation and within the TTL."""
+        return entry[2] == self._generation and time.monotonic() - entry[1] < self.availability_ttl
+    
+    def _is_cached(self, name: str) -> bool:
+        """Whether a fresh (current generation, within TTL) availability is cached for name."""
+        entry = self._tool_availability_cache.get(name)
+        return entry is not None and self._entry_is_fresh(entry)
+    
+    def _warm_adapter_availability(self) -> None:
+        """
+        Run the version checks of all adapters with a cold cache concurrently.
+        
+        The checks are subprocess calls that release the GIL while waiting, so a small
+        thread pool turns N sequential round-trips into roughly one.
+        """
+        cold = [name for name in self._real_tool_adapters if not self._is_cached(name)]
+        if len(cold) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(cold), _MAX_VERSION_CHECK_WORKERS)) as pool:
+            list(pool.map(self.validate_tool_availability, cold))
+    
+    async def refresh_all_async(self) -> Dict[str, ToolAvailability]:
+        """
+        Re-check every real tool adapter concurrently on the running event loop.
+        
+        Invalidates the availability cache first. Synchronous callers doing one big
+        sweep can use ``asyncio.run(registry.refresh_all_async())``.
+        
+        Returns:
+            Mapping of adapter name to its fresh ToolAvailability
+        """
+        self.clear_availability_cache()
+        generation = self._generation
+        adapters = list(self._real_tool_adapters.values())
+        results = await asyncio.gather(
+            *(adapter.check_availability_async(generation=generation) for adapter in adapters)
+        )
+        now = time.monotonic()
+        for adapter, availability in zip(adapters, results):
+            self._tool_availability_cache[adapter.name] = (availability, now, generation)
+        return {adapter.name: availability for adapter, availability in zip(adapters, results)}
+    
     def clear_availability_cache(self) -> None:
-        """Clear the tool availability cache."""
-        self._tool_availability_cache.clear()
-        # Also clear adapter caches
-        for adapter in self._real_tool_adapters.values():
-            adapter._cached_availability = None
+        """
+        Invalidate the tool availability cache.
+        
+        Bumps the cache generation instead of clearing entries: registry entries and
+        adapter caches stored under an older generation are ignored on the next lookup.
+        """
+        self._generation += 1
+    
+    def _partition_tools(self) -> Tuple[List[str], List[str]]:
+        """
+        Split registered tool names into (available, unavailable) with one list_tools pass.
+        
+        The result is reused until the cache generation changes, a tool is registered,
+        or it is older than the availability TTL.
+        """
+        cached = self._partition_cache
+        if (cached is not None and cached[0] == self._generation
+                and time.monotonic() - cached[1] < self.availability_ttl):
+            return cached[2]
+        
+        available_tools = []
+        unavailable_tools = []
+        for tool_info in self.list_tools(include_availability=True):
+            if tool_info.available:
+                available_tools.append(tool_info.name)
+            else:
+                unavailable_tools.append(tool_info.name)
+        partition = (available_tools, unavailable_tools)
+        self._partition_cache = (self._generation, time.monotonic(), partition)
+        return partition
     
     def get_available_tools(self) -> List[str]:
         """
@@ -404,11 +616,7 @@ class ToolRegistry:
         Returns:
             List of tool names that are currently available
         """
-        available_tools = []
-        for tool_info in self.list_tools():
-            if tool_info.available:
-                available_tools.append(tool_info.name)
-        return available_tools
+        return list(self._partition_tools()[0])
     
     def get_unavailable_tools(self) -> List[str]:
         """
@@ -417,11 +625,7 @@ class ToolRegistry:
         Returns:
             List of tool names that are currently unavailable
         """
-        unavailable_tools = []
-        for tool_info in self.list_tools():
-            if not tool_info.available:
-                unavailable_tools.append(tool_info.name)
-        return unavailable_tools
+        return list(self._partition_tools()[1])
 
 
 # Global registry instance
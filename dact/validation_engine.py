@@ -1,15 +1,23 @@
 """
 Validation engine for test case validation.
 """
+import codecs
 import os
 import re
+import threading
 import json
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dact.models import CaseValidation
 from dact.logger import log
 
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
 
 class ValidationResult:
     """Result of a validation check."""
@@ -20,101 +28,261 @@ class ValidationResult:
         self.details = details or {}
 
 
+# Encodings (codecs names) whose encoded bytes can be compared instead of decoding the file
+_BYTE_COMPARABLE_ENCODINGS = {"utf-8", "ascii"}
+
+# Longest stdout/stderr/output string stored in a result's details
+_MAX_DETAIL_CHARS = 4096
+
+# Validations that make the rest of a case meaningless when they fail (fail_fast)
+_CRITICAL_VALIDATION_TYPES = {"exit_code", "file_exists"}
+# Validations skipped under fail_fast once a critical one has failed
+_EXPENSIVE_VALIDATION_TYPES = {"json_schema", "xml_schema", "file_content", "performance"}
+
+# Validations doing file I/O or schema work, which make a per-case thread pool worthwhile
+_IO_VALIDATION_TYPES = {"file_exists", "file_not_exists", "file_size", "file_content",
+                        "json_schema", "xml_schema"}
+_PARALLEL_VALIDATION_THRESHOLD = 4
+_MAX_VALIDATION_WORKERS = 8
+
+# An unanchored leading ".*"/".*?" not followed by another quantifier
+_LEADING_WILDCARD_RE = re.compile(r'\.\*\??(?![*+?{])')
+# A trailing ".*"/".*?" whose dot is not escaped
+_TRAILING_WILDCARD_RE = re.compile(r'(?<!\\)(?:\\\\)*\.\*\??\Z')
+
+
+def _strip_redundant_wildcards(pattern: str) -> str:
+    """
+    Drop a leading/trailing ".*" that cannot change whether re.search finds a match.
+    
+    ".*" may match zero characters, so "x" is found exactly when ".*x" or "x.*" is.
+    Removing it lets the regex engine use its literal-prefix scan instead of trying
+    the wildcard at every position. Anchored forms ("^.*", ".*$") are left alone.
+    """
+    while _LEADING_WILDCARD_RE.match(pattern):
+        pattern = _LEADING_WILDCARD_RE.sub('', pattern, count=1)
+    trailing = _TRAILING_WILDCARD_RE.search(pattern)
+    if trailing:
+        # Keep any escaped backslashes the match consumed before the dot
+        pattern = pattern[:trailing.start()] + trailing.group().rsplit('.', 1)[0]
+    return pattern
+
+
+class _CaseCache:
+    """
+    Per-case memo of file stats/contents and parsed JSON.
+    
+    Several validations of one case often target the same file (file_exists, file_size,
+    file_content, json_schema...); each path is stat()ed and read at most once. A new
+    instance is used for every validate_case call, so a later case sees fresh files.
+    """
+    
+    def __init__(self):
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
+        self._contents: Dict[str, bytes] = {}
+        # "output:<name>" / "file:<path>" -> parsed JSON
+        self._json: Dict[str, Any] = {}
+    
+    def stat(self, file_path: Path) -> Optional[os.stat_result]:
+        """stat() result for file_path, or None if it does not exist."""
+        key = str(file_path)
+        try:
+            return self._stats[key]
+        except KeyError:
+            pass
+        try:
+            stat_result = file_path.stat()
+        except OSError:
+            stat_result = None
+        self._stats[key] = stat_result
+        return stat_result
+    
+    def read_bytes(self, file_path: Path) -> bytes:
+        """Raw content of file_path."""
+        key = str(file_path)
+        content = self._contents.get(key)
+        if content is None:
+            content = file_path.read_bytes()
+            self._contents[key] = content
+        return content
+    
+    def read_text(self, file_path: Path, encoding: str) -> str:
+        """Content decoded like Path.read_text (including universal newline translation)."""
+        text = self.read_bytes(file_path).decode(encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+    
+    def parse_json(self, key: str, text: Any) -> Any:
+        """json.loads(text), memoized under key. Raises json.JSONDecodeError (not cached)."""
+        try:
+            return self._json[key]
+        except KeyError:
+            pass
+        value = json.loads(text)
+        self._json[key] = value
+        return value
+
+
+def _truncate_detail(value: Any) -> Any:
+    """Cap a string kept in ValidationResult.details, which outlive the case run."""
+    if isinstance(value, str) and len(value) > _MAX_DETAIL_CHARS:
+        return value[:_MAX_DETAIL_CHARS] + "...(truncated)"
+    return value
+
+
 class ValidationEngine:
     """Engine for executing various types of validations."""
     
     def __init__(self):
         self.custom_validators = {}
+        # pattern -> compiled regex, or the re.error it raised (so bad patterns aren't retried)
+        self._pattern_cache: Dict[str, Any] = {}
+        # canonical JSON of a schema -> checked jsonschema validator instance
+        self._json_validators: Dict[str, Any] = {}
+        # XSD source -> compiled lxml XMLSchema
+        self._xml_schema_cache: Dict[Any, Any] = {}
+        self._xsd_parser = None
+        # Guards the schema cache and the XSD parser (lxml parsers must not be shared between threads)
+        self._xsd_lock = threading.Lock()
     
     def register_custom_validator(self, name: str, validator_func):
         """Register a custom validation function."""
         self.custom_validators[name] = validator_func
     
+    def _compile(self, pattern: str) -> "re.Pattern":
+        """
+        Compile a regex once per engine. Raises re.error for an invalid pattern.
+        
+        The result is only for re.search truthiness, so redundant outer ".*" are dropped.
+        """
+        compiled = self._pattern_cache.get(pattern)
+        if compiled is None:
+            stripped = _strip_redundant_wildcards(pattern)
+            try:
+                compiled = re.compile(stripped)
+            except re.error as e:
+                compiled = e
+            if isinstance(compiled, re.error) and stripped != pattern:
+                try:
+                    # Report (or, if it compiles, use) the pattern as written
+                    compiled = re.compile(pattern)
+                except re.error as e:
+                    compiled = e
+            self._pattern_cache[pattern] = compiled
+        if isinstance(compiled, re.error):
+            raise re.error(compiled.msg, compiled.pattern, compiled.pos)
+        return compiled
+    
     def validate_case(self, validations: List[CaseValidation], 
                      execution_result: Dict[str, Any], 
-                     work_dir: Path) -> List[ValidationResult]:
-        """Execute all validations for a test case."""
-        results = []
-        
-        for validation in validations:
-            try:
-                result = self._execute_validation(validation, execution_result, work_dir)
-                results.append(result)
-                
-                if validation.description:
-                    log.info(f"  Validation '{validation.description}': {'✓' if result.is_valid else '✗'}")
-                else:
-                    log.info(f"  Validation {validation.type}: {'✓' if result.is_valid else '✗'}")
-                    
-                if not result.is_valid:
-                    log.error(f"    {result.message}")
-                    
-            except Exception as e:
-                error_result = ValidationResult(
-                    is_valid=False,
-                    message=f"Validation execution failed: {str(e)}",
-                    details={"validation": validation.dict(), "error": str(e)}
-                )
-                results.append(error_result)
-                log.error(f"  Validation {validation.type} failed with error: {e}")
-        
+                     work_dir: Path,
+                     fail_fast: bool = False) -> List[ValidationResult]:
+        """
+        Execute all validations for a test case.
+        
+        With fail_fast, cheap validations run first; once a critical one (exit_code,
+        file_exists) fails, expensive ones (schemas, file content, performance) are
+        reported as skipped instead of run. Results are always in the input order.
+        """
+        cache = _CaseCache()
+        if not fail_fast:
+            if self._should_parallelize(validations):
+                workers = min(_MAX_VALIDATION_WORKERS, len(validations))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    outcomes = list(pool.map(
+                        lambda v: self._guarded_execute(v, execution_result, work_dir, cache),
+                        validations
+                    ))
+                # Log afterwards so the output stays in validation order
+                for validation, (result, error) in zip(validations, outcomes):
+                    self._log_result(validation, result, error)
+                return [result for result, _ in outcomes]
+            return [self._run_validation(validation, execution_result, work_dir, cache)
+                    for validation in validations]
+        
+        results: List[Optional[ValidationResult]] = [None] * len(validations)
+        critical_failed = False
+        # Stable sort: cheap validations first, each group in its original order
+        for i in sorted(range(len(validations)),
+                        key=lambda i: validations[i].type in _EXPENSIVE_VALIDATION_TYPES):
+            validation = validations[i]
+            if critical_failed and validation.type in _EXPENSIVE_VALIDATION_TYPES:
+                results[i] = ValidationResult(False, "Skipped: an earlier critical validation failed",
+                                              {"skipped": True})
+                log.info(f"  Validation {validation.type}: skipped")
+                continue
+            results[i] = self._run_validation(validation, execution_result, work_dir, cache)
+            if not results[i].is_valid and validation.type in _CRITICAL_VALIDATION_TYPES:
+                critical_failed = True
         return results
     
+    @staticmethod
+    def _should_parallelize(validations: List[CaseValidation]) -> bool:
+        """
+        Whether a case's validations are worth a thread pool.
+        
+        Only for several validations including file I/O or schema work (which release
+        the GIL); never with custom validators, which may not be thread-safe.
+        """
+        if len(validations) < _PARALLEL_VALIDATION_THRESHOLD:
+            return False
+        types = {v.type for v in validations}
+        return "custom" not in types and not types.isdisjoint(_IO_VALIDATION_TYPES)
+    
+    def _run_validation(self, validation: CaseValidation,
+                        execution_result: Dict[str, Any],
+                        work_dir: Path,
+                        cache: _CaseCache) -> ValidationResult:
+        """Execute one validation and log its outcome."""
+        result, error = self._guarded_execute(validation, execution_result, work_dir, cache)
+        self._log_result(validation, result, error)
+        return result
+    
+    def _guarded_execute(self, validation: CaseValidation,
+                         execution_result: Dict[str, Any],
+                         work_dir: Path,
+                         cache: _CaseCache) -> Tuple[ValidationResult, Optional[Exception]]:
+        """Execute one validation, turning an error into a failed result (returned alongside)."""
+        try:
+            return self._execute_validation(validation, execution_result, work_dir, cache), None
+        except Exception as e:
+            return ValidationResult(
+                is_valid=False,
+                message=f"Validation execution failed: {str(e)}",
+                details={"validation": validation.dict(), "error": str(e)}
+            ), e
+    
+    @staticmethod
+    def _log_result(validation: CaseValidation, result: ValidationResult,
+                    error: Optional[Exception] = None) -> None:
+        if error is not None:
+            log.error(f"  Validation {validation.type} failed with error: {error}")
+            return
+        
+        if validation.description:
+            log.info(f"  Validation '{validation.description}': {'✓' if result.is_valid else '✗'}")
+        else:
+            log.info(f"  Validation {validation.type}: {'✓' if result.is_valid else '✗'}")
+            
+        if not result.is_valid:
+            log.error(f"    {result.message}")
+    
     def _execute_validation(self, validation: CaseValidation, 
                           execution_result: Dict[str, Any], 
-                          work_dir: Path) -> ValidationResult:
+                          work_dir: Path,
+                          cache: Optional[_CaseCache] = None) -> ValidationResult:
         """Execute a single validation."""
+        if cache is None:
+            cache = _CaseCache()
         
-        if validation.type == "exit_code":
-            return self._validate_exit_code(validation, execution_result)
-        
-        elif validation.type == "stdout_contains":
-            return self._validate_stdout_contains(validation, execution_result)
-        
-        elif validation.type == "stderr_not_contains":
-            return self._validate_stderr_not_contains(validation, execution_result)
-        
-        elif validation.type == "file_exists":
-            return self._validate_file_exists(validation, work_dir)
-        
-        elif validation.type == "file_not_exists":
-            return self._validate_file_not_exists(validation, work_dir)
-        
-        elif validation.type == "file_size":
-            return self._validate_file_size(validation, work_dir)
-        
-        elif validation.type == "output_equals":
-            return self._validate_output_equals(validation, execution_result)
-        
-        elif validation.type == "output_contains":
-            return self._validate_output_contains(validation, execution_result)
-        
-        elif validation.type == "output_matches":
-            return self._validate_output_matches(validation, execution_result)
-        
-        elif validation.type == "file_content":
-            return self._validate_file_content(validation, work_dir)
-        
-        elif validation.type == "performance":
-            return self._validate_performance(validation, execution_result)
-        
-        elif validation.type == "json_schema":
-            return self._validate_json_schema(validation, execution_result, work_dir)
-        
-        elif validation.type == "xml_schema":
-            return self._validate_xml_schema(validation, execution_result, work_dir)
-        
-        elif validation.type == "numeric_range":
-            return self._validate_numeric_range(validation, execution_result)
-        
-        elif validation.type == "custom":
-            return self._validate_custom(validation, execution_result, work_dir)
-        
-        else:
+        handler = self._DISPATCH.get(validation.type)
+        if handler is None:
             return ValidationResult(
                 is_valid=False,
                 message=f"Unknown validation type: {validation.type}"
             )
+        return handler(self, validation, execution_result, work_dir, cache)
     
     def _validate_exit_code(self, validation: CaseValidation, 
                            execution_result: Dict[str, Any]) -> ValidationResult:
@@ -146,7 +314,7 @@ class ValidationEngine:
         
         return ValidationResult(is_valid, message, {
             "expected": expected_text,
-            "actual": stdout
+            "actual": _truncate_detail(stdout)
         })
     
     def _validate_stderr_not_contains(self, validation: CaseValidation, 
@@ -165,16 +333,17 @@ class ValidationEngine:
         
         return ValidationResult(is_valid, message, {
             "forbidden": forbidden_text,
-            "actual": stderr
+            "actual": _truncate_detail(stderr)
         })
     
-    def _validate_file_exists(self, validation: CaseValidation, work_dir: Path) -> ValidationResult:
+    def _validate_file_exists(self, validation: CaseValidation, work_dir: Path,
+                              cache: _CaseCache) -> ValidationResult:
         """Validate that a file exists."""
         if not validation.target:
             return ValidationResult(False, "File path not specified for file_exists validation")
         
         file_path = work_dir / validation.target
-        is_valid = file_path.exists()
+        is_valid = cache.stat(file_path) is not None
         message = f"Expected file '{validation.target}' to exist"
         if not is_valid:
             message += f" in {work_dir}"
@@ -184,39 +353,42 @@ class ValidationEngine:
             "exists": is_valid
         })
     
-    def _validate_file_not_exists(self, validation: CaseValidation, work_dir: Path) -> ValidationResult:
+    def _validate_file_not_exists(self, validation: CaseValidation, work_dir: Path,
+                                  cache: _CaseCache) -> ValidationResult:
         """Validate that a file does not exist."""
         if not validation.target:
             return ValidationResult(False, "File path not specified for file_not_exists validation")
         
         file_path = work_dir / validation.target
-        is_valid = not file_path.exists()
+        is_valid = cache.stat(file_path) is None
         message = f"Expected file '{validation.target}' to not exist"
         if not is_valid:
             message += f", but it exists in {work_dir}"
         
         return ValidationResult(is_valid, message, {
             "file_path": str(file_path),
-            "exists": file_path.exists()
+            "exists": not is_valid
         })
     
-    def _validate_file_size(self, validation: CaseValidation, work_dir: Path) -> ValidationResult:
+    def _validate_file_size(self, validation: CaseValidation, work_dir: Path,
+                            cache: _CaseCache) -> ValidationResult:
         """Validate file size."""
         if not validation.target:
             return ValidationResult(False, "File path not specified for file_size validation")
         
         file_path = work_dir / validation.target
-        if not file_path.exists():
+        stat_result = cache.stat(file_path)
+        if stat_result is None:
             return ValidationResult(False, f"File '{validation.target}' does not exist")
         
-        actual_size = file_path.stat().st_size
+        actual_size = stat_result.st_size
         expected_size = validation.expected
         tolerance = validation.tolerance or 0
         
         if expected_size is None:
             return ValidationResult(False, "Expected file size not specified")
         
-        is_valid = abs(actual_size - expected_size) <= tolerance
+        is_valid = expected_size - tolerance <= actual_size <= expected_size + tolerance
         message = f"Expected file size {expected_size} ± {tolerance}, got {actual_size}"
         
         return ValidationResult(is_valid, message, {
@@ -240,7 +412,7 @@ class ValidationEngine:
         
         return ValidationResult(is_valid, message, {
             "expected": expected_value,
-            "actual": actual_value
+            "actual": _truncate_detail(actual_value)
         })
     
     def _validate_output_contains(self, validation: CaseValidation, 
@@ -263,7 +435,7 @@ class ValidationEngine:
         
         return ValidationResult(is_valid, message, {
             "expected": expected_text,
-            "actual": actual_value
+            "actual": _truncate_detail(actual_value)
         })
     
     def _validate_output_matches(self, validation: CaseValidation, 
@@ -279,7 +451,7 @@ class ValidationEngine:
         actual_value = str(outputs.get(validation.target, ""))
         
         try:
-            is_valid = bool(re.search(validation.pattern, actual_value))
+            is_valid = bool(self._compile(validation.pattern).search(actual_value))
             message = f"Expected output '{validation.target}' to match pattern '{validation.pattern}'"
             if not is_valid:
                 message += f", got '{actual_value}'"
@@ -291,18 +463,25 @@ class ValidationEngine:
         except re.error as e:
             return ValidationResult(False, f"Invalid regex pattern '{validation.pattern}': {e}")
     
-    def _validate_file_content(self, validation: CaseValidation, work_dir: Path) -> ValidationResult:
+    def _validate_file_content(self, validation: CaseValidation, work_dir: Path,
+                               cache: _CaseCache) -> ValidationResult:
         """Validate file content against expected content or pattern."""
         if not validation.target:
             return ValidationResult(False, "File path not specified for file_content validation")
         
         file_path = work_dir / validation.target
-        if not file_path.exists():
+        if cache.stat(file_path) is None:
             return ValidationResult(False, f"File '{validation.target}' does not exist")
         
         try:
             encoding = validation.encoding or "utf-8"
-            content = file_path.read_text(encoding=encoding)
+            if validation.expected is not None and self._raw_content_equals(
+                    cache.read_bytes(file_path), validation.expected, encoding):
+                return ValidationResult(True, "Expected file content to match exactly", {
+                    "file_path": str(file_path),
+                    "content_length": len(validation.expected)
+                })
+            content = cache.read_text(file_path, encoding)
             
             if validation.expected is not None:
                 # Exact content match
@@ -312,7 +491,7 @@ class ValidationEngine:
                     message += f", got content with length {len(content)}"
             elif validation.pattern:
                 # Pattern match
-                is_valid = bool(re.search(validation.pattern, content))
+                is_valid = bool(self._compile(validation.pattern).search(content))
                 message = f"Expected file content to match pattern '{validation.pattern}'"
                 if not is_valid:
                     message += f", content: {content[:100]}..."
@@ -329,6 +508,24 @@ class ValidationEngine:
         except Exception as e:
             return ValidationResult(False, f"Failed to read file '{validation.target}': {e}")
     
+    @staticmethod
+    def _raw_content_equals(raw: bytes, expected: Any, encoding: str) -> bool:
+        """
+        Exact-match fast path that skips decoding the file.
+        
+        For UTF-8/ASCII, bytes equal to the encoded expected text decode back to exactly
+        that text. Files with carriage returns are left to the decode path because of
+        newline translation. False only means "not proven equal", never "different".
+        """
+        if not isinstance(expected, str) or b"\r" in raw:
+            return False
+        if codecs.lookup(encoding).name not in _BYTE_COMPARABLE_ENCODINGS:
+            return False
+        try:
+            return len(raw) >= len(expected) and raw == expected.encode(encoding)
+        except UnicodeEncodeError:
+            return False
+    
     def _validate_performance(self, validation: CaseValidation, 
                              execution_result: Dict[str, Any]) -> ValidationResult:
         """Validate performance metrics."""
@@ -345,7 +542,7 @@ class ValidationEngine:
         # Validate against expected value with tolerance
         if validation.expected is not None:
             tolerance = validation.tolerance or 0
-            is_valid = abs(actual_value - validation.expected) <= tolerance
+            is_valid = validation.expected - tolerance <= actual_value <= validation.expected + tolerance
             message = f"Expected {validation.target} to be {validation.expected} ± {tolerance}, got {actual_value}"
         # Validate against min/max range
         elif validation.min_value is not None or validation.max_value is not None:
@@ -376,11 +573,10 @@ class ValidationEngine:
     
     def _validate_json_schema(self, validation: CaseValidation, 
                              execution_result: Dict[str, Any], 
-                             work_dir: Path) -> ValidationResult:
+                             work_dir: Path,
+                             cache: _CaseCache) -> ValidationResult:
         """Validate JSON content against a schema."""
-        try:
-            import jsonschema
-        except ImportError:
+        if jsonschema is None:
             return ValidationResult(False, "jsonschema library not available for JSON schema validation")
         
         if not validation.validation_schema:
@@ -391,11 +587,10 @@ class ValidationEngine:
             if validation.target.endswith('.json'):
                 # Validate file content
                 file_path = work_dir / validation.target
-                if not file_path.exists():
+                if cache.stat(file_path) is None:
                     return ValidationResult(False, f"JSON file '{validation.target}' does not exist")
                 try:
-                    with open(file_path, 'r') as f:
-                        json_data = json.load(f)
+                    json_data = cache.parse_json(f"file:{file_path}", cache.read_bytes(file_path))
                 except json.JSONDecodeError as e:
                     return ValidationResult(False, f"Invalid JSON in file '{validation.target}': {e}")
             else:
@@ -406,23 +601,39 @@ class ValidationEngine:
                 json_data = outputs[validation.target]
                 if isinstance(json_data, str):
                     try:
-                        json_data = json.loads(json_data)
+                        json_data = cache.parse_json(f"output:{validation.target}", json_data)
                     except json.JSONDecodeError as e:
                         return ValidationResult(False, f"Output '{validation.target}' is not valid JSON: {e}")
         else:
             return ValidationResult(False, "Target not specified for JSON schema validation")
         
         try:
-            jsonschema.validate(json_data, validation.validation_schema)
+            validator = self._json_validator(validation.validation_schema)
+            for error in validator.iter_errors(json_data):
+                return ValidationResult(False, f"JSON schema validation failed: {error.message}")
             return ValidationResult(True, f"JSON data validates against schema")
-        except jsonschema.ValidationError as e:
-            return ValidationResult(False, f"JSON schema validation failed: {e.message}")
         except Exception as e:
             return ValidationResult(False, f"JSON schema validation error: {e}")
     
+    def _json_validator(self, schema: Dict[str, Any]):
+        """
+        Validator for schema, built and meta-schema checked once per distinct schema.
+        
+        Keyed by the schema's canonical JSON, so equal schemas from different cases share it.
+        """
+        key = json.dumps(schema, sort_keys=True, default=str)
+        validator = self._json_validators.get(key)
+        if validator is None:
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            validator = validator_cls(schema)
+            self._json_validators[key] = validator
+        return validator
+    
     def _validate_xml_schema(self, validation: CaseValidation, 
                             execution_result: Dict[str, Any], 
-                            work_dir: Path) -> ValidationResult:
+                            work_dir: Path,
+                            cache: _CaseCache) -> ValidationResult:
         """Validate XML content against a schema."""
         try:
             from lxml import etree
@@ -437,38 +648,57 @@ class ValidationEngine:
             if validation.target.endswith('.xml'):
                 # Validate file content
                 file_path = work_dir / validation.target
-                if not file_path.exists():
+                if cache.stat(file_path) is None:
                     return ValidationResult(False, f"XML file '{validation.target}' does not exist")
-                try:
-                    xml_doc = etree.parse(str(file_path))
-                except etree.XMLSyntaxError as e:
-                    return ValidationResult(False, f"Invalid XML in file '{validation.target}': {e}")
+                xml_content = cache.read_bytes(file_path)
+                invalid_xml = f"Invalid XML in file '{validation.target}'"
             else:
                 # Validate output variable
                 outputs = execution_result.get("outputs", {})
                 if validation.target not in outputs:
                     return ValidationResult(False, f"Output variable '{validation.target}' not found")
                 xml_content = outputs[validation.target]
-                try:
-                    xml_doc = etree.fromstring(xml_content)
-                except etree.XMLSyntaxError as e:
-                    return ValidationResult(False, f"Output '{validation.target}' is not valid XML: {e}")
+                invalid_xml = f"Output '{validation.target}' is not valid XML"
         else:
             return ValidationResult(False, "Target not specified for XML schema validation")
         
         try:
             # Create schema from validation.validation_schema (should be XSD content)
-            schema_doc = etree.fromstring(validation.validation_schema)
-            schema = etree.XMLSchema(schema_doc)
+            with self._xsd_lock:
+                schema = self._xml_schema(etree, validation.validation_schema)
             
-            if schema.validate(xml_doc):
-                return ValidationResult(True, "XML validates against schema")
-            else:
-                errors = [str(error) for error in schema.error_log]
+            # Parsed with lxml's per-thread default parser, so validations can overlap
+            try:
+                xml_doc = etree.fromstring(xml_content)
+            except etree.XMLSyntaxError as e:
+                return ValidationResult(False, f"{invalid_xml}: {e}")
+            try:
+                schema.assertValid(xml_doc)
+            except etree.DocumentInvalid as e:
+                # The exception keeps this run's errors; schema.error_log is shared by all threads
+                errors = [str(error) for error in e.error_log]
                 return ValidationResult(False, f"XML schema validation failed: {'; '.join(errors)}")
+            return ValidationResult(True, "XML validates against schema")
         except Exception as e:
             return ValidationResult(False, f"XML schema validation error: {e}")
     
+    def _xml_schema(self, etree, schema_source):
+        """
+        XMLSchema compiled once per distinct XSD source.
+        
+        Call with _xsd_lock held: it guards the cache and the shared XSD parser.
+        """
+        try:
+            return self._xml_schema_cache[schema_source]
+        except (KeyError, TypeError):
+            pass
+        if self._xsd_parser is None:
+            self._xsd_parser = etree.XMLParser(remove_blank_text=True)
+        schema = etree.XMLSchema(etree.fromstring(schema_source, self._xsd_parser))
+        if isinstance(schema_source, (str, bytes)):
+            self._xml_schema_cache[schema_source] = schema
+        return schema
+    
     def _validate_numeric_range(self, validation: CaseValidation, 
                                execution_result: Dict[str, Any]) -> ValidationResult:
         """Validate that a numeric value is within specified range."""
@@ -526,4 +756,23 @@ class ValidationEngine:
             else:
                 return ValidationResult(False, f"Custom validator returned invalid result type: {type(result)}")
         except Exception as e:
-            return ValidationResult(False, f"Custom validator '{validation.custom_validator}' failed: {e}")
\ No newline at end of file
+            return ValidationResult(False, f"Custom validator '{validation.custom_validator}' failed: {e}")
+    
+    # validation type -> handler(engine, validation, execution_result, work_dir, cache)
+    _DISPATCH = {
+        "exit_code": lambda self, v, result, work_dir, cache: self._validate_exit_code(v, result),
+        "stdout_contains": lambda self, v, result, work_dir, cache: self._validate_stdout_contains(v, result),
+        "stderr_not_contains": lambda self, v, result, work_dir, cache: self._validate_stderr_not_contains(v, result),
+        "file_exists": lambda self, v, result, work_dir, cache: self._validate_file_exists(v, work_dir, cache),
+        "file_not_exists": lambda self, v, result, work_dir, cache: self._validate_file_not_exists(v, work_dir, cache),
+        "file_size": lambda self, v, result, work_dir, cache: self._validate_file_size(v, work_dir, cache),
+        "output_equals": lambda self, v, result, work_dir, cache: self._validate_output_equals(v, result),
+        "output_contains": lambda self, v, result, work_dir, cache: self._validate_output_contains(v, result),
+        "output_matches": lambda self, v, result, work_dir, cache: self._validate_output_matches(v, result),
+        "file_content": lambda self, v, result, work_dir, cache: self._validate_file_content(v, work_dir, cache),
+        "performance": lambda self, v, result, work_dir, cache: self._validate_performance(v, result),
+        "json_schema": lambda self, v, result, work_dir, cache: self._validate_json_schema(v, result, work_dir, cache),
+        "xml_schema": lambda self, v, result, work_dir, cache: self._validate_xml_schema(v, result, work_dir, cache),
+        "numeric_range": lambda self, v, result, work_dir, cache: self._validate_numeric_range(v, result),
+        "custom": lambda self, v, result, work_dir, cache: self._validate_custom(v, result, work_dir),
+    }
@@ -1,12 +1,109 @@
+import functools
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import re
 import yaml
+from dact.logger import log
 from dact.models import CaseFile
+from dact.runner import _discover_case_files
+from dact.yaml_utils import YAML_LOADER, load_yaml
+
+
+_HEADER_TEMPLATE = """\
+import pytest
+from pathlib import Path
+from dact.runner import load_catalog, run_case
+from dact.models import Case
+
+ROOT = Path(__file__).resolve().parent
+
+
+@pytest.fixture(scope="session")
+def dact_catalog():
+    # 工具与场景在整个会话中只加载一次
+    return load_catalog(ROOT)
+
+
+# 通用参数（来自 YAML 顶层 common_params）
+COMMON_PARAMS = {common_params_lit}
+
+"""
+_HEADER_HEAD, _HEADER_TAIL = _HEADER_TEMPLATE.split("{common_params_lit}")
+
+# Generated test function for one case; literals are pre-rendered with _py_literal
+_CASE_TEMPLATE = """\
+def {func_name}(dact_catalog):
+    # 合并通用参数和用例参数
+    params = dict(COMMON_PARAMS)
+    params.update({params_lit})
+    case = Case(
+        name={case_name_lit},
+        description={desc_lit},
+        scenario={scenario_lit},
+        tool={tool_lit},
+        params=params,
+        validation={validation_lit},
+    )
+    result = run_case(case, ROOT, debug=False, catalog=dact_catalog)
+    if not result.success:
+        pytest.fail(f"Case failed: {{case.name}}. See logs: {{result.work_dir}}", pytrace=False)
+
+"""
+
+# First line of every generated module. The hash changes with the templates above, so
+# outputs written by an older converter are regenerated instead of kept as up to date.
+_GENERATOR_VERSION = hashlib.sha256((_HEADER_TEMPLATE + _CASE_TEMPLATE).encode("utf-8")).hexdigest()[:12]
+_MARKER_TEMPLATE = "# Generated by dact gen-py {version} from {source}\n"
+
+
+_slow_loader_warned = False
+
+_NON_WORD_RE = re.compile(r"\W+")
+# ASCII non-word characters -> NUL (itself non-word), so runs can be collapsed with split()
+_ASCII_NON_WORD_TABLE = str.maketrans({c: "\0" for c in map(chr, range(128)) if _NON_WORD_RE.match(c)})
+
+
+# Module for convert_case_yamls_batch: all cases in one list, one parametrized test.
+# Split once at {cases_lit} and concatenated, so the braces below stay literal.
+_BATCH_TEMPLATE = """\
+import pytest
+from pathlib import Path
+from dact.runner import load_catalog, run_case
+from dact.models import Case
+
+ROOT = Path(__file__).resolve().parent
+
+
+@pytest.fixture(scope="session")
+def dact_catalog():
+    # 工具与场景在整个会话中只加载一次
+    return load_catalog(ROOT)
+
+
+# 所有用例（各 YAML 的 common_params 已合并进 params）
+CASES = {cases_lit}
+
+
+@pytest.mark.parametrize("case_data", CASES, ids=[c["name"] for c in CASES])
+def test_case(case_data, dact_catalog):
+    case = Case(**case_data)
+    result = run_case(case, ROOT, debug=False, catalog=dact_catalog)
+    if not result.success:
+        pytest.fail(f"Case failed: {case.name}. See logs: {result.work_dir}", pytrace=False)
+"""
+_BATCH_HEAD, _BATCH_TAIL = _BATCH_TEMPLATE.split("{cases_lit}")
 
 
 def _slugify(name: str) -> str:
-    s = re.sub(r"\W+", "_", name.lower()).strip("_")
+    lowered = name.lower()
+    if lowered.isascii():
+        # Same result as the regex below: each run of non-word characters becomes one "_"
+        s = "_".join(part for part in lowered.translate(_ASCII_NON_WORD_TABLE).split("\0") if part).strip("_")
+    else:
+        s = _NON_WORD_RE.sub("_", lowered).strip("_")
     if not s or not s[0].isalpha():
         s = f"case_{s or 'unnamed'}"
     return s
@@ -19,65 +116,151 @@ def _py_literal(value):
     return repr(value)
 
 
-def convert_case_yaml_to_py(yaml_case: str, output_py: Optional[str] = None) -> str:
+def _warn_slow_loader() -> None:
+    global _slow_loader_warned
+    if YAML_LOADER is yaml.SafeLoader and not _slow_loader_warned:
+        _slow_loader_warned = True
+        log.warning("libyaml 不可用（或设置了 DACT_DISABLE_CYAML），使用纯 Python YAML 解析器")
+
+
+def _load_case_file(yaml_case: str) -> CaseFile:
     p = Path(yaml_case)
     if not p.exists():
         raise FileNotFoundError(f"{yaml_case} 不存在")
 
-    data = yaml.safe_load(p.read_text(encoding="utf-8"))
+    # An unchanged file (same mtime and size) reuses the already validated CaseFile
+    st = p.stat()
+    return _parse_case_file(str(p.resolve()), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_case_file(path: str, mtime_ns: int, size: int) -> CaseFile:
+    _warn_slow_loader()
+    # Let libyaml (when available) read and decode the file directly
+    with open(path, "rb") as f:
+        data = load_yaml(f)
     if not isinstance(data, dict) or "cases" not in data:
         raise ValueError("YAML 格式不合法：缺少 'cases'")
 
-    case_file = CaseFile(**data)
+    return CaseFile(**data)
 
-    # Header
-    lines = []
-    lines.append("import pytest")
-    lines.append("from pathlib import Path")
-    lines.append("from dact.runner import run_case")
-    lines.append("from dact.models import Case")
-    lines.append("")
-    lines.append("# 通用参数（来自 YAML 顶层 common_params）")
-    lines.append(f"COMMON_PARAMS = {_py_literal(case_file.common_params or {})}")
-    lines.append("")
 
-    # One test function per case
-    for c in case_file.cases:
-        func_name = f"test_{_slugify(c.name)}"
-        case_name_lit = _py_literal(c.name)
-        desc_lit = _py_literal(c.description)
-        scenario_lit = _py_literal(c.scenario)
-        tool_lit = _py_literal(c.tool)
-        params_lit = _py_literal(c.params or {})
-        validation_lit = _py_literal([v.dict() for v in (c.validation or [])])
-
-        body = []
-        body.append(f"def {func_name}():")
-        body.append("    root = Path(__file__).resolve().parent")
-        body.append("    # 合并通用参数和用例参数")
-        body.append("    params = {}.copy()")
-        body.append("    params.update(COMMON_PARAMS or {})")
-        body.append(f"    params.update({params_lit})")
-        body.append("    case = Case(")
-        body.append(f"        name={case_name_lit},")
-        body.append(f"        description={desc_lit},")
-        body.append(f"        scenario={scenario_lit},")
-        body.append(f"        tool={tool_lit},")
-        body.append("        params=params,")
-        body.append(f"        validation={validation_lit},")
-        body.append("    )")
-        body.append("    result = run_case(case, root, debug=False)")
-        body.append("    if not result.success:")
-        body.append("        pytest.fail(f\"Case failed: {case.name}. See logs: {result.work_dir}\", pytrace=False)")
-        body.append("")
-
-        lines.extend(body)
-
-    content = "\n".join(lines) + "\n"
+def _write_atomic(out: Path, content: str) -> None:
+    """Write content to out through a sibling temp file and os.replace()."""
+    data = content.encode("utf-8")
+    # Leave an identical file untouched so its mtime stays stable
+    try:
+        if out.stat().st_size == len(data) and out.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    try:
+        os.replace(tmp, out)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _dump_validations(case_file: CaseFile) -> List[list]:
+    """Serialize every case's validations in one model_dump call, in case order."""
+    dumped = case_file.model_dump(include={"cases": {"__all__": {"validation"}}})
+    return [c["validation"] for c in dumped["cases"]]
+
 
+def _is_up_to_date(out: Path, yaml_path: Path, marker: str) -> bool:
+    """Whether out carries marker (same converter, same source) and is not older than yaml_path."""
+    try:
+        if out.stat().st_mtime_ns < yaml_path.stat().st_mtime_ns:
+            return False
+        with open(out, "rb") as f:
+            return f.readline() == marker.encode("utf-8")
+    except OSError:
+        return False
+
+
+def convert_case_yaml_to_py(yaml_case: str, output_py: Optional[str] = None, force: bool = False) -> str:
+    p = Path(yaml_case)
     out = Path(output_py) if output_py else p.with_suffix("").with_suffix("")
     if not output_py:
         out = out.with_name(f"test_{out.name}_generated.py")
-    out.write_text(content, encoding="utf-8")
+
+    # Incremental: keep an output this converter wrote from the same, unchanged YAML
+    marker = _MARKER_TEMPLATE.format(version=_GENERATOR_VERSION, source=p.resolve().as_posix())
+    if not force and _is_up_to_date(out, p, marker):
+        return str(out)
+
+    case_file = _load_case_file(yaml_case)
+
+    chunks = [marker, _HEADER_HEAD, _py_literal(case_file.common_params or {}), _HEADER_TAIL]
+
+    # One test function per case
+    for c, validations in zip(case_file.cases, _dump_validations(case_file)):
+        chunks.append(_CASE_TEMPLATE.format(
+            func_name=f"test_{_slugify(c.name)}",
+            case_name_lit=_py_literal(c.name),
+            desc_lit=_py_literal(c.description),
+            scenario_lit=_py_literal(c.scenario),
+            tool_lit=_py_literal(c.tool),
+            params_lit=_py_literal(c.params or {}),
+            validation_lit=_py_literal(validations),
+        ))
+
+    content = "".join(chunks)
+    _write_atomic(out, content)
     return str(out)
 
+
+def convert_case_yamls_batch(yaml_cases: List[str], output_py: str) -> str:
+    """Convert several case YAML files into one module with a single parametrized test.
+
+    Each file's common_params are merged into its cases up front, so the module only
+    holds a CASES list; pytest imports and collects one module for all of them.
+    """
+    case_dicts = []
+    for yaml_case in yaml_cases:
+        case_file = _load_case_file(yaml_case)
+        for c, validations in zip(case_file.cases, _dump_validations(case_file)):
+            params = dict(case_file.common_params or {})
+            params.update(c.params or {})
+            case_dicts.append({
+                "name": c.name,
+                "description": c.description,
+                "scenario": c.scenario,
+                "tool": c.tool,
+                "params": params,
+                "validation": validations,
+            })
+
+    # One repr() over the whole list; the module is read by pytest, not people
+    content = "".join((_BATCH_HEAD, _py_literal(case_dicts), _BATCH_TAIL))
+
+    out = Path(output_py)
+    _write_atomic(out, content)
+    return str(out)
+
+
+def convert_directory(directory: str, max_workers: Optional[int] = None,
+                      output_py: Optional[str] = None, force: bool = False) -> List[str]:
+    """Convert every *.case.yml under directory, one worker process per core.
+
+    Files are found like `dact run <directory>` finds them (hidden and output
+    directories are skipped). Each file is written next to its YAML, as
+    convert_case_yaml_to_py does by default; with output_py, all cases go into that
+    one module instead (see convert_case_yamls_batch). force regenerates up-to-date outputs.
+    """
+    yaml_paths = [str(p) for p in _discover_case_files(Path(directory))]
+    if not yaml_paths:
+        return []
+    if output_py:
+        return [convert_case_yamls_batch(yaml_paths, output_py)]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        convert = functools.partial(convert_case_yaml_to_py, force=force)
+        return list(ex.map(convert, yaml_paths, chunksize=8))
@@ -0,0 +1,16 @@
+"""
+YAML loading shared by the tool, scenario and case file loaders.
+"""
+import os
+import yaml
+
+# libyaml-backed safe loader when PyYAML was built with it; DACT_DISABLE_CYAML forces the pure-Python one
+if os.environ.get("DACT_DISABLE_CYAML"):
+    YAML_LOADER = yaml.SafeLoader
+else:
+    YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(stream):
+    """Like yaml.safe_load, with YAML_LOADER. Files can be passed opened in binary mode."""
+    return yaml.load(stream, Loader=YAML_LOADER)
@@ -7,39 +7,99 @@ DACT Pipeline 文档构建脚本
 
 import os
 import sys
+import shlex
 import shutil
 import subprocess
+import urllib.request
 import argparse
+import functools
+import hashlib
+import http.server
+import io
 from pathlib import Path
 
 
 def run_command(cmd, cwd=None):
-    """运行命令并检查结果"""
-    print(f"Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print(f"Error running command: {cmd}")
-        print(f"stdout: {result.stdout}")
-        print(f"stderr: {result.stderr}")
+    """运行命令并逐行输出，失败时退出（cmd 可以是参数列表或命令字符串）"""
+    argv = shlex.split(cmd) if isinstance(cmd, str) else [str(a) for a in cmd]
+    print(f"Running: {shlex.join(argv)}")
+    try:
+        proc = subprocess.Popen(argv, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, bufsize=1)
+    except FileNotFoundError:
+        print(f"Error running command: {shlex.join(argv)} ({argv[0]} not found)")
+        sys.exit(1)
+    with proc.stdout:
+        for line in proc.stdout:
+            print(line, end="")
+    returncode = proc.wait()
+    
+    if returncode != 0:
+        print(f"Error running command: {shlex.join(argv)} (exit code {returncode})")
         sys.exit(1)
     
-    return result
+    return returncode
+
+
+# --clean 时保留的缓存：doctree 缓存与依赖安装标记
+PRESERVED_BUILD_ENTRIES = {".doctrees", ".requirements.sha256"}
+
+
+def doctree_dir(build_dir, language):
+    """各格式共用的 doctree 缓存目录（按语言区分）"""
+    return build_dir / ".doctrees" / language
 
 
 def clean_build_dir(build_dir):
-    """清理构建目录"""
+    """清理构建目录（保留 .doctrees 等缓存，未修改的源文件无需重新解析）"""
     if build_dir.exists():
         print(f"Cleaning build directory: {build_dir}")
-        shutil.rmtree(build_dir)
+        for child in build_dir.iterdir():
+            if child.name in PRESERVED_BUILD_ENTRIES:
+                continue
+            if child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
     
     build_dir.mkdir(parents=True, exist_ok=True)
 
 
-def install_dependencies():
-    """安装文档构建依赖"""
+def sphinx_command(builder, source_dir, build_dir, out_dir, language):
+    """构造 sphinx-build 命令；不传 -E，以便复用 doctree 缓存做增量构建"""
+    return ["sphinx-build", "-j", "auto", "-b", builder, "-D", f"language={language}",
+            "-d", doctree_dir(build_dir, language), source_dir, out_dir]
+
+
+def install_dependencies(build_dir):
+    """安装文档构建依赖（requirements.txt 与解释器均未变化时跳过）"""
+    # 标记中包含解释器路径与版本，换用其他 venv/Python 复用同一 _build 时会重新安装
+    hasher = hashlib.sha256(Path("requirements.txt").read_bytes())
+    hasher.update(f"\0{sys.executable}\0{tuple(sys.version_info)}".encode("utf-8"))
+    digest = hasher.hexdigest()
+    stamp = build_dir / ".requirements.sha256"
+    if stamp.exists() and stamp.read_text().strip() == digest:
+        print("Documentation dependencies up to date, skipping install")
+        return
+    
     print("Installing documentation dependencies...")
-    run_command("pip install -r requirements.txt")
+    run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+    build_dir.mkdir(parents=True, exist_ok=True)
+    stamp.write_text(digest)
+
+
+def fetch_intersphinx_inventories(docs_dir):
+    """下载 intersphinx 的 objects.inv 到 _inv/，之后构建时直接读取本地文件"""
+    sys.path.insert(0, str(docs_dir))
+    from conf import _INTERSPHINX_URLS, _INV_DIR
+    
+    inv_dir = Path(_INV_DIR)
+    inv_dir.mkdir(parents=True, exist_ok=True)
+    for name, url in _INTERSPHINX_URLS.items():
+        target = inv_dir / f"{name}.inv"
+        print(f"Fetching {url}objects.inv -> {target}")
+        with urllib.request.urlopen(f"{url}objects.inv", timeout=30) as resp:
+            target.write_bytes(resp.read())
 
 
 def build_html_docs(source_dir, build_dir, language="zh_CN"):
@@ -49,7 +109,7 @@ def build_html_docs(source_dir, build_dir, language="zh_CN"):
     html_dir = build_dir / f"html-{language}"
     html_dir.mkdir(parents=True, exist_ok=True)
     
-    cmd = f"sphinx-build -b html -D language={language} {source_dir} {html_dir}"
+    cmd = sphinx_command("html", source_dir, build_dir, html_dir, language)
     run_command(cmd)
     
     print(f"HTML documentation built in: {html_dir}")
@@ -64,14 +124,18 @@ def build_pdf_docs(source_dir, build_dir, language="zh_CN"):
     latex_dir.mkdir(parents=True, exist_ok=True)
     
     # 构建 LaTeX
-    cmd = f"sphinx-build -b latex -D language={language} {source_dir} {latex_dir}"
+    cmd = sphinx_command("latex", source_dir, build_dir, latex_dir, language)
     run_command(cmd)
     
     # 构建 PDF
     pdf_file = latex_dir / "dact-pipeline.pdf"
     if (latex_dir / "dact-pipeline.tex").exists():
-        run_command("pdflatex dact-pipeline.tex", cwd=latex_dir)
-        run_command("pdflatex dact-pipeline.tex", cwd=latex_dir)  # 运行两次确保交叉引用正确
+        if shutil.which("latexmk"):
+            # latexmk 只运行交叉引用收敛所需的遍数
+            run_command(["latexmk", "-pdf", "-interaction=nonstopmode", "dact-pipeline.tex"], cwd=latex_dir)
+        else:
+            run_command(["pdflatex", "dact-pipeline.tex"], cwd=latex_dir)
+            run_command(["pdflatex", "dact-pipeline.tex"], cwd=latex_dir)  # 运行两次确保交叉引用正确
         
         if pdf_file.exists():
             print(f"PDF documentation built: {pdf_file}")
@@ -88,7 +152,7 @@ def build_epub_docs(source_dir, build_dir, language="zh_CN"):
     epub_dir = build_dir / f"epub-{language}"
     epub_dir.mkdir(parents=True, exist_ok=True)
     
-    cmd = f"sphinx-build -b epub -D language={language} {source_dir} {epub_dir}"
+    cmd = sphinx_command("epub", source_dir, build_dir, epub_dir, language)
     run_command(cmd)
     
     epub_file = epub_dir / "dact-pipeline.epub"
@@ -99,16 +163,47 @@ def build_epub_docs(source_dir, build_dir, language="zh_CN"):
     return None
 
 
+class SendfileHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """用 os.sendfile 发送文件内容，由内核直接从页缓存写入 socket"""
+
+    def copyfile(self, source, outputfile):
+        if not hasattr(os, "sendfile"):
+            return super().copyfile(source, outputfile)
+        try:
+            infd = source.fileno()
+            outfd = self.connection.fileno()
+            offset = source.tell()
+            remaining = os.fstat(infd).st_size - offset
+        except (AttributeError, io.UnsupportedOperation, OSError):
+            # 目录列表等内容来自内存中的 BytesIO，没有文件描述符
+            return super().copyfile(source, outputfile)
+        try:
+            while remaining > 0:
+                sent = os.sendfile(outfd, infd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except ConnectionError:
+            raise
+        except OSError:
+            # 文件系统不支持 sendfile 时，从已发送的位置起改用普通拷贝
+            source.seek(offset)
+            return super().copyfile(source, outputfile)
+
+
 def serve_docs(html_dir, port=8000):
     """启动文档服务器"""
     print(f"Starting documentation server on port {port}...")
     print(f"Documentation available at: http://localhost:{port}")
     print("Press Ctrl+C to stop the server")
     
-    try:
-        run_command(f"python -m http.server {port}", cwd=html_dir)
-    except KeyboardInterrupt:
-        print("\nServer stopped")
+    handler = functools.partial(SendfileHTTPRequestHandler, directory=str(html_dir))
+    with http.server.ThreadingHTTPServer(("", port), handler) as httpd:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nServer stopped")
 
 
 def main():
@@ -125,6 +220,8 @@ def main():
                        help="Port for documentation server")
     parser.add_argument("--install-deps", action="store_true", 
                        help="Install documentation dependencies")
+    parser.add_argument("--fetch-inventories", action="store_true",
+                       help="Download intersphinx inventories into _inv/ for offline builds")
     
     args = parser.parse_args()
     
@@ -138,7 +235,11 @@ def main():
     
     # 安装依赖
     if args.install_deps:
-        install_dependencies()
+        install_dependencies(build_dir)
+    
+    # 下载 intersphinx 清单
+    if args.fetch_inventories:
+        fetch_intersphinx_inventories(docs_dir)
     
     # 清理构建目录
     if args.clean:
@@ -3,6 +3,8 @@
 # For the full list of built-in configuration values, see the documentation:
 # https://www.sphinx-doc.org/en/master/usage/configuration.html
 
+import os
+
 # -- Project information -----------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#project-information
 
@@ -54,20 +56,34 @@ myst_enable_extensions = [
 ]
 
 # -- Options for autodoc ----------------------------------------------------
+# undoc-members / special-members are requested per directive where needed,
+# so autodoc does not introspect every attribute of every module by default.
 autodoc_default_options = {
     'members': True,
     'member-order': 'bysource',
-    'special-members': '__init__',
-    'undoc-members': True,
     'exclude-members': '__weakref__'
 }
 
 # -- Options for intersphinx extension --------------------------------------
+_INTERSPHINX_URLS = {
+    'python': 'https://docs.python.org/3/',
+    'pytest': 'https://docs.pytest.org/en/stable/',
+    'pydantic': 'https://docs.pydantic.dev/',
+}
+# Inventories vendored in _inv/ (build_docs.py --fetch-inventories) are read
+# from disk; the remote objects.inv is only fetched when no local copy exists.
+_INV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_inv')
+
+
+def _inventory(name):
+    local = os.path.join(_INV_DIR, f'{name}.inv')
+    return local if os.path.exists(local) else None
+
+
 intersphinx_mapping = {
-    'python': ('https://docs.python.org/3/', None),
-    'pytest': ('https://docs.pytest.org/en/stable/', None),
-    'pydantic': ('https://docs.pydantic.dev/', None),
+    name: (url, _inventory(name)) for name, url in _INTERSPHINX_URLS.items()
 }
+intersphinx_timeout = 10
 
 # -- Options for todo extension ---------------------------------------------
 todo_include_todos = True
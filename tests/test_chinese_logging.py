@@ -3,56 +3,96 @@ Tests for Chinese character support in logging system.
 """
 import pytest
 import tempfile
+import io
 import os
+import logging
+import logging.handlers
 from pathlib import Path
+from rich.console import Console
 from dact.logger import log, console, info_chinese, error_chinese, warning_chinese, debug_chinese, setup_file_logging
 
 
+@pytest.fixture(scope="module")
+def log_records():
+    """Records of the dact logger, captured by one handler for the whole module."""
+    # flushLevel above CRITICAL: the handler has no target and only buffers
+    handler = logging.handlers.MemoryHandler(10_000, flushLevel=logging.CRITICAL + 1)
+    previous_level = log.level
+    log.addHandler(handler)
+    log.setLevel(logging.DEBUG)
+    yield handler.buffer
+    log.removeHandler(handler)
+    log.setLevel(previous_level)
+
+
+@pytest.fixture(autouse=True)
+def _clear_log_records(log_records):
+    log_records.clear()
+
+
+def _any_has(records, needle):
+    """Whether any captured record's message contains needle."""
+    return any(needle in record.getMessage() for record in records)
+
+
+@pytest.fixture
+def encoding_console():
+    """A console like dact's whose output is buffered but still encoded.
+
+    Text goes through a strict encoder using the encoding of the dact console's own
+    stream, so a character that terminal cannot encode raises UnicodeEncodeError.
+    """
+    encoding = getattr(console.file, "encoding", None) or "utf-8"
+    stream = io.TextIOWrapper(io.BytesIO(), encoding=encoding, errors="strict", write_through=True)
+    yield Console(file=stream, force_terminal=True, legacy_windows=False)
+    stream.close()
+
+
+def _encoded_output(test_console):
+    """Everything printed to an encoding_console, decoded back from its bytes."""
+    stream = test_console.file
+    return stream.buffer.getvalue().decode(stream.encoding)
+
+
 class TestChineseCharacterSupport:
     """Test Chinese character support in logging."""
     
-    def test_basic_chinese_logging(self, caplog):
+    def test_basic_chinese_logging(self, log_records):
         """Test basic Chinese character logging."""
         chinese_message = "测试中文字符: Hello 世界"
         
-        with caplog.at_level("INFO"):
-            log.info(chinese_message)
+        log.info(chinese_message)
         
         # Verify the message was logged
-        assert len(caplog.records) == 1
+        assert len(log_records) == 1
         # Note: The exact comparison might vary due to Rich formatting
         # We check that Chinese characters are present in some form
-        logged_message = str(caplog.records[0].getMessage())
+        logged_message = str(log_records[0].getMessage())
         assert "测试" in logged_message or "中文" in logged_message
     
-    def test_chinese_logging_functions(self, caplog):
+    @pytest.mark.parametrize("func,message,keyword", [
+        (info_chinese, "信息: 这是一个信息消息", "信息"),
+        (error_chinese, "错误: 这是一个错误消息", "错误"),
+        (warning_chinese, "警告: 这是一个警告消息", "警告"),
+        (debug_chinese, "调试: 这是一个调试消息", "调试"),
+    ])
+    def test_chinese_logging_functions(self, log_records, func, message, keyword):
         """Test specialized Chinese logging functions."""
-        test_cases = [
-            ("info", info_chinese, "信息: 这是一个信息消息"),
-            ("error", error_chinese, "错误: 这是一个错误消息"),
-            ("warning", warning_chinese, "警告: 这是一个警告消息"),
-            ("debug", debug_chinese, "调试: 这是一个调试消息")
-        ]
+        func(message)
         
-        for level, func, message in test_cases:
-            with caplog.at_level("DEBUG"):
-                caplog.clear()
-                func(message)
-                
-                if caplog.records:
-                    logged_message = str(caplog.records[0].getMessage())
-                    # Check that Chinese characters are preserved
-                    assert any(char in logged_message for char in ["信息", "错误", "警告", "调试"])
+        assert len(log_records) == 1
+        logged_message = str(log_records[0].getMessage())
+        # Check that Chinese characters are preserved
+        assert keyword in logged_message
     
-    def test_mixed_language_logging(self, caplog):
+    def test_mixed_language_logging(self, log_records):
         """Test logging with mixed Chinese and English."""
         mixed_message = "Test 测试 - English and 中文 mixed content"
         
-        with caplog.at_level("INFO"):
-            log.info(mixed_message)
+        log.info(mixed_message)
         
-        assert len(caplog.records) == 1
-        logged_message = str(caplog.records[0].getMessage())
+        assert len(log_records) == 1
+        logged_message = str(log_records[0].getMessage())
         # Verify both English and Chinese characters are present
         assert "Test" in logged_message
         assert ("测试" in logged_message or "中文" in logged_message)
@@ -71,8 +111,8 @@ class TestChineseCharacterSupport:
             # Verify file was created and contains Chinese characters
             assert log_file.exists()
             
-            # Read file with UTF-8 encoding
-            content = log_file.read_text(encoding='utf-8')
+            # Read file as UTF-8 bytes (no newline translation needed)
+            content = log_file.read_bytes().decode('utf-8')
             assert "文件日志测试" in content
             assert "中文支持" in content
             
@@ -81,25 +121,31 @@ class TestChineseCharacterSupport:
             log.removeHandler(file_handler)
             file_handler.close()
     
-    def test_console_chinese_output(self):
+    def test_console_chinese_output(self, encoding_console):
         """Test console Chinese character output."""
         # This test verifies that console can handle Chinese characters
         # without throwing encoding errors
         chinese_text = "控制台输出测试: Console output test"
         
+        lines = [
+            chinese_text,
+            f"[green]{chinese_text}[/green]",
+            f"[red]错误消息[/red]: Error message",
+            f"[yellow]警告消息[/yellow]: Warning message",
+        ]
+        
         try:
-            # This should not raise any encoding errors
-            console.print(chinese_text)
-            console.print(f"[green]{chinese_text}[/green]")
-            console.print(f"[red]错误消息[/red]: Error message")
-            console.print(f"[yellow]警告消息[/yellow]: Warning message")
-            
-            # If we reach here, Chinese output is working
-            assert True
+            # This should not raise any encoding errors; one render, encoded into a buffer
+            encoding_console.print("\n".join(lines))
         except UnicodeEncodeError:
             pytest.fail("Console failed to handle Chinese characters")
+        
+        output = _encoded_output(encoding_console)
+        assert "控制台输出测试" in output
+        assert "错误消息" in output
+        assert "警告消息" in output
     
-    def test_chinese_in_rich_markup(self):
+    def test_chinese_in_rich_markup(self, encoding_console):
         """Test Chinese characters in Rich markup."""
         test_cases = [
             "[green]成功[/green]: 操作完成",
@@ -108,15 +154,18 @@ class TestChineseCharacterSupport:
             "[blue]信息[/blue]: 提示信息"
         ]
         
-        for markup_text in test_cases:
-            try:
-                console.print(markup_text)
-                # If no exception is raised, the test passes
-                assert True
-            except Exception as e:
-                pytest.fail(f"Rich markup failed with Chinese characters: {e}")
+        try:
+            encoding_console.print("\n".join(test_cases))
+        except Exception as e:
+            pytest.fail(f"Rich markup failed with Chinese characters: {e}")
+        
+        output = _encoded_output(encoding_console)
+        for text in ["成功", "操作完成", "失败", "警告", "信息"]:
+            assert text in output
+        # Markup tags are rendered, not printed
+        assert "[green]" not in output
     
-    def test_chinese_parameter_rendering(self, caplog):
+    def test_chinese_parameter_rendering(self, log_records):
         """Test Chinese characters in parameter rendering scenarios."""
         # Simulate parameter rendering with Chinese content
         params = {
@@ -125,76 +174,65 @@ class TestChineseCharacterSupport:
             "mixed_param": "Mixed 混合 content"
         }
         
-        with caplog.at_level("INFO"):
-            for key, value in params.items():
-                log.info(f"参数 {key}: {value}")
+        for key, value in params.items():
+            log.info(f"参数 {key}: {value}")
         
         # Verify all messages were logged
-        assert len(caplog.records) == 3
+        assert len(log_records) == 3
         
         # Check that Chinese characters are preserved in parameter names and values
-        all_messages = " ".join([str(record.getMessage()) for record in caplog.records])
-        assert "中文参数" in all_messages
-        assert "中文值" in all_messages
-        assert "混合" in all_messages
+        assert _any_has(log_records, "中文参数")
+        assert _any_has(log_records, "中文值")
+        assert _any_has(log_records, "混合")
 
 
 class TestLoggingModes:
     """Test different logging modes (simple and debug)."""
     
-    def test_simple_mode_chinese(self, caplog):
+    def test_simple_mode_chinese(self, log_records):
         """Test simple logging mode with Chinese characters."""
-        with caplog.at_level("INFO"):
-            log.info("简单模式: 执行命令成功")
+        log.info("简单模式: 执行命令成功")
         
-        assert len(caplog.records) == 1
-        message = str(caplog.records[0].getMessage())
+        assert len(log_records) == 1
+        message = str(log_records[0].getMessage())
         assert "简单模式" in message
     
-    def test_debug_mode_chinese(self, caplog):
+    @pytest.mark.parametrize("message,keyword", [
+        ("调试模式: 详细执行信息", "调试模式"),
+        ("参数值: param1=值1, param2=值2", "参数值"),
+        ("执行状态: 正在处理中...", "执行状态"),
+    ])
+    def test_debug_mode_chinese(self, log_records, message, keyword):
         """Test debug logging mode with Chinese characters."""
-        with caplog.at_level("DEBUG"):
-            log.debug("调试模式: 详细执行信息")
-            log.debug("参数值: param1=值1, param2=值2")
-            log.debug("执行状态: 正在处理中...")
+        log.debug(message)
         
-        assert len(caplog.records) == 3
-        all_messages = " ".join([str(record.getMessage()) for record in caplog.records])
-        assert "调试模式" in all_messages
-        assert "参数值" in all_messages
-        assert "执行状态" in all_messages
+        assert len(log_records) == 1
+        assert keyword in str(log_records[0].getMessage())
 
 
 class TestErrorHandling:
     """Test error handling with Chinese characters."""
     
-    def test_chinese_error_messages(self, caplog):
+    @pytest.mark.parametrize("message,keyword", [
+        ("错误: 文件未找到", "错误"),
+        ("异常: 参数验证失败", "异常"),
+        ("失败: 命令执行超时", "失败"),
+    ])
+    def test_chinese_error_messages(self, log_records, message, keyword):
         """Test error messages with Chinese characters."""
-        error_messages = [
-            "错误: 文件未找到",
-            "异常: 参数验证失败",
-            "失败: 命令执行超时"
-        ]
-        
-        with caplog.at_level("ERROR"):
-            for msg in error_messages:
-                log.error(msg)
+        log.error(message)
         
-        assert len(caplog.records) == 3
-        all_messages = " ".join([str(record.getMessage()) for record in caplog.records])
-        assert "错误" in all_messages
-        assert "异常" in all_messages
-        assert "失败" in all_messages
+        assert len(log_records) == 1
+        assert keyword in str(log_records[0].getMessage())
     
-    def test_chinese_exception_logging(self, caplog):
+    def test_chinese_exception_logging(self, log_records):
         """Test exception logging with Chinese characters."""
         try:
             raise ValueError("中文异常消息: Invalid parameter value")
         except ValueError as e:
-            with caplog.at_level("ERROR"):
-                log.error(f"捕获异常: {str(e)}")
+            log.error(f"捕获异常: {str(e)}")
         
-        assert len(caplog.records) == 1
-        message = str(caplog.records[0].getMessage())
+        assert len(log_records) == 1
+        message = str(log_records[0].getMessage())
         assert "捕获异常" in message
         assert "中文异常消息" in message
\ No newline at end of file
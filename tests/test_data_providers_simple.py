@@ -2,67 +2,72 @@
 Simple tests for data providers.
 """
 import pytest
-import tempfile
 import json
-import csv
-from pathlib import Path
 from dact.data_providers import CSVDataProvider, JSONDataProvider, load_test_data
 
 
-def test_json_data_provider():
+def test_json_data_provider(tmp_path):
     """Test JSON data provider."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        test_data = [
-            {"name": "test1", "value": 10, "expected": True},
-            {"name": "test2", "value": 20, "expected": False}
-        ]
-        json.dump(test_data, f)
-        json_file = f.name
+    test_data = [
+        {"name": "test1", "value": 10, "expected": True},
+        {"name": "test2", "value": 20, "expected": False}
+    ]
+    json_file = tmp_path / "test_data.json"
+    json_file.write_text(json.dumps(test_data), encoding='utf-8')
     
-    try:
-        provider = JSONDataProvider()
-        data = provider.load_data(json_file)
-        
-        assert len(data) == 2
-        assert data[0]['name'] == 'test1'
-        assert data[0]['value'] == 10
-        assert data[1]['expected'] == False
-    finally:
-        Path(json_file).unlink()
+    provider = JSONDataProvider()
+    data = provider.load_data(str(json_file))
+    
+    assert len(data) == 2
+    assert data[0]['name'] == 'test1'
+    assert data[0]['value'] == 10
+    assert data[1]['expected'] == False
+
 
+def test_json_data_provider_invalid_json(tmp_path):
+    """Test that a malformed JSON file is reported as a ValueError naming the file."""
+    json_file = tmp_path / "broken.json"
+    json_file.write_text('[{"name": "test1",', encoding='utf-8')
+    
+    with pytest.raises(ValueError, match="broken.json"):
+        JSONDataProvider().load_data(str(json_file))
 
-def test_csv_data_provider():
+
+def test_csv_data_provider(tmp_path):
     """Test CSV data provider."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['name', 'value', 'expected'])
-        writer.writerow(['test1', '10', 'true'])
-        writer.writerow(['test2', '20', 'false'])
-        csv_file = f.name
+    csv_file = tmp_path / "test_data.csv"
+    csv_file.write_bytes(b"name,value,expected\r\ntest1,10,true\r\ntest2,20,false\r\n")
+    
+    provider = CSVDataProvider()
+    data = provider.load_data(str(csv_file))
     
-    try:
-        provider = CSVDataProvider()
-        data = provider.load_data(csv_file)
-        
-        assert len(data) == 2
-        assert data[0]['name'] == 'test1'
-        assert data[0]['value'] == 10  # Should be converted to int
-        assert data[1]['expected'] == False  # Should be converted to bool
-    finally:
-        Path(csv_file).unlink()
+    assert len(data) == 2
+    assert data[0]['name'] == 'test1'
+    assert data[0]['value'] == 10  # Should be converted to int
+    assert data[1]['expected'] == False  # Should be converted to bool
 
 
-def test_load_test_data_convenience():
+def test_csv_data_provider_iter(tmp_path):
+    """Test that CSV rows are yielded lazily as the file is read."""
+    csv_file = tmp_path / "test_data.csv"
+    csv_file.write_text("name,value\ntest1,10\ntest2,20\n", encoding='utf-8')
+    
+    provider = CSVDataProvider()
+    rows = provider.load_data_iter(str(csv_file))
+    
+    assert next(rows) == {'name': 'test1', 'value': 10}
+    assert list(rows) == [{'name': 'test2', 'value': 20}]
+    with pytest.raises(FileNotFoundError):
+        provider.load_data_iter(str(tmp_path / "missing.csv"))
+
+
+def test_load_test_data_convenience(tmp_path):
     """Test the convenience function for loading test data."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        test_data = [{"name": "test1", "value": 10}]
-        json.dump(test_data, f)
-        json_file = f.name
+    # The format is picked from the file extension, so this one goes through a real file
+    json_file = tmp_path / "test_data.json"
+    json_file.write_text(json.dumps([{"name": "test1", "value": 10}]), encoding='utf-8')
+    
+    data = load_test_data(str(json_file))
     
-    try:
-        data = load_test_data(json_file)
-        
-        assert len(data) == 1
-        assert data[0]['name'] == 'test1'
-    finally:
-        Path(json_file).unlink()
\ No newline at end of file
+    assert len(data) == 1
+    assert data[0]['name'] == 'test1'
\ No newline at end of file
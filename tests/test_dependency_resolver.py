@@ -2,6 +2,7 @@
 Unit tests for the dependency resolver functionality.
 """
 import pytest
+from unittest.mock import patch
 from dact.models import Scenario, Step
 from dact.dependency_resolver import DependencyResolver, DependencyGraph, DependencyNode
 
@@ -31,6 +32,21 @@ class TestDependencyResolver:
         assert "setup" in dependencies
         assert len(dependencies) == 2
     
+    def test_extract_dependencies_from_nested_params(self):
+        """Test that template references inside dict and list params are found."""
+        step = Step(
+            name="test_step",
+            tool="test_tool",
+            params={
+                "inputs": ["{{ steps.step_a.outputs.file }}", "static.txt"],
+                "options": {"config": "{{ steps.step_b.outputs.config }}", "retries": 3}
+            }
+        )
+        
+        dependencies = self.resolver._extract_template_dependencies(step)
+        
+        assert set(dependencies) == {"step_a", "step_b"}
+    
     def test_extract_explicit_dependencies(self):
         """Test extraction of explicit dependencies from step definition."""
         step = Step(
@@ -233,6 +249,36 @@ class TestDependencyResolver:
         
         dependents = self.resolver.get_step_dependents(scenario, "step3")
         assert len(dependents) == 0
+        
+        # A graph from extract_dependencies is reused instead of extracted again
+        graph = self.resolver.extract_dependencies(scenario)
+        assert graph.dependents == {"step1": ["step2", "step3"]}
+        with patch.object(self.resolver, "extract_dependencies") as extract:
+            assert self.resolver.get_step_dependents(scenario, "step1", graph) == ["step2", "step3"]
+        extract.assert_not_called()
+    
+    def test_accessors_follow_changed_steps(self):
+        """Test that accessors see steps added after an earlier lookup."""
+        scenario = Scenario(
+            name="test_scenario",
+            steps=[Step(name="step1", tool="tool1"), Step(name="step2", tool="tool2", depends_on=["step1"])]
+        )
+        assert self.resolver.get_step_dependents(scenario, "step1") == ["step2"]
+        
+        scenario.steps.append(Step(name="step3", tool="tool3", depends_on=["step1"]))
+        
+        assert self.resolver.get_step_dependents(scenario, "step1") == ["step2", "step3"]
+    
+    def test_get_step_dependencies_returns_a_copy(self):
+        """Test that changing a returned dependency list does not change the graph."""
+        scenario = Scenario(
+            name="test_scenario",
+            steps=[Step(name="step1", tool="tool1"), Step(name="step2", tool="tool2", depends_on=["step1"])]
+        )
+        graph = self.resolver.extract_dependencies(scenario)
+        self.resolver.get_step_dependencies(scenario, "step2", graph).append("bogus")
+        
+        assert graph.nodes["step2"].dependencies == ["step1"]
     
     def test_generate_mermaid_diagram(self):
         """Test generation of Mermaid diagram."""
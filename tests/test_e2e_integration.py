@@ -6,10 +6,7 @@ This module contains integration tests that validate the complete
 end-to-end functionality of the DACT pipeline system.
 """
 
-import os
 import sys
-import tempfile
-import shutil
 import pytest
 from pathlib import Path
 
@@ -19,29 +16,41 @@ sys.path.insert(0, str(project_root))
 
 from dact.tool_loader import load_tools_from_directory
 from dact.scenario_loader import load_scenarios_from_directory
-from dact.executor import Executor, POST_EXEC_FUNCTIONS
+from dact.executor import Executor, POST_EXEC_FUNCTIONS, _compile_template
 from dact.models import Tool, Scenario
 
 
+@pytest.fixture(scope="session")
+def tools():
+    """Tool definitions from the project's tools directory, loaded once per session."""
+    return load_tools_from_directory(str(project_root / "tools"))
+
+
+@pytest.fixture(scope="session")
+def scenarios():
+    """Scenario definitions from the project's scenarios directory, loaded once per session."""
+    return load_scenarios_from_directory(str(project_root / "scenarios"))
+
+
+@pytest.fixture(scope="class")
+def test_root(tmp_path_factory):
+    """Temporary root shared by a test class; pytest removes old roots itself."""
+    return tmp_path_factory.mktemp("dact_e2e")
+
+
+@pytest.fixture
+def test_dir(test_root, request):
+    """Per-test directory under the shared class root."""
+    d = test_root / request.node.name
+    d.mkdir()
+    return d
+
+
 class TestE2EIntegration:
     """End-to-End Integration Test Suite"""
     
-    def setup_method(self):
-        """Setup test environment"""
-        self.test_dir = Path(tempfile.mkdtemp(prefix="dact_e2e_test_"))
-        self.original_cwd = os.getcwd()
-        os.chdir(project_root)
-    
-    def teardown_method(self):
-        """Cleanup test environment"""
-        os.chdir(self.original_cwd)
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
-    
-    def test_tool_loading(self):
+    def test_tool_loading(self, tools):
         """Test that all required tools can be loaded"""
-        tools = load_tools_from_directory("tools")
-        
         # Verify required tools exist
         required_tools = ["ai-json-operator", "atc", "file-validator", "demo-tool"]
         for tool_name in required_tools:
@@ -53,10 +62,8 @@ class TestE2EIntegration:
             assert tool.name == tool_name, f"Tool name mismatch: {tool.name} != {tool_name}"
             assert tool.command_template, f"Tool '{tool_name}' missing command template"
     
-    def test_scenario_loading(self):
+    def test_scenario_loading(self, scenarios):
         """Test that scenarios can be loaded and validated"""
-        scenarios = load_scenarios_from_directory("scenarios")
-        
         # Verify e2e scenario exists
         assert "e2e-onnx-to-atc" in scenarios, "E2E scenario not found"
         
@@ -85,10 +92,10 @@ class TestE2EIntegration:
             assert func_name in POST_EXEC_FUNCTIONS, f"Required function '{func_name}' not found"
             assert callable(POST_EXEC_FUNCTIONS[func_name]), f"Function '{func_name}' is not callable"
     
-    def test_find_onnx_file_function(self):
+    def test_find_onnx_file_function(self, test_dir):
         """Test the find_onnx_file function with mock data"""
         # Create mock directory structure
-        mock_dir = self.test_dir / "mock_output"
+        mock_dir = test_dir / "mock_output"
         mock_subdir = mock_dir / "Conv_testcase_98bd3f" / "resources"
         mock_subdir.mkdir(parents=True)
         
@@ -102,10 +109,10 @@ class TestE2EIntegration:
         
         assert found_file == str(mock_onnx_file), f"Expected {mock_onnx_file}, got {found_file}"
     
-    def test_find_onnx_dir_function(self):
+    def test_find_onnx_dir_function(self, test_dir):
         """Test the find_onnx_dir function with mock data"""
         # Create mock directory structure
-        mock_dir = self.test_dir / "mock_output"
+        mock_dir = test_dir / "mock_output"
         mock_subdir = mock_dir / "Conv_testcase_98bd3f" / "resources"
         mock_subdir.mkdir(parents=True)
         
@@ -119,35 +126,33 @@ class TestE2EIntegration:
         
         assert found_dir == str(mock_subdir), f"Expected {mock_subdir}, got {found_dir}"
     
-    def test_file_validator_tool_execution(self):
+    def test_file_validator_tool_execution(self, tools, test_dir):
         """Test file validator tool execution"""
-        tools = load_tools_from_directory("tools")
         file_validator = tools["file-validator"]
         
         # Create test files
-        test_dir = self.test_dir / "validator_test"
-        test_dir.mkdir()
-        (test_dir / "test1.txt").write_text("test content 1")
-        (test_dir / "test2.txt").write_text("test content 2")
+        validator_dir = test_dir / "validator_test"
+        validator_dir.mkdir()
+        (validator_dir / "test1.txt").write_text("test content 1")
+        (validator_dir / "test2.txt").write_text("test content 2")
         
         # Execute file validator
         executor = Executor(file_validator, {
-            "check_path": str(test_dir),
+            "check_path": str(validator_dir),
             "expected_files": ["*.txt"],
             "min_size": 5,
             "recursive": False
         })
         
-        result = executor.execute(self.test_dir)
+        result = executor.execute(test_dir)
         
         # Verify execution results
         assert result["returncode"] == 0, f"File validator failed: {result['stderr']}"
         assert "validation" in result, "Validation results missing"
         assert result["validation"]["success"], f"Validation failed: {result['validation']}"
     
-    def test_tool_parameter_rendering(self):
+    def test_tool_parameter_rendering(self, tools):
         """Test Jinja2 parameter rendering in tools"""
-        tools = load_tools_from_directory("tools")
         ai_json_operator = tools["ai-json-operator"]
         
         # Test parameter rendering
@@ -158,11 +163,11 @@ class TestE2EIntegration:
             "output_dir": "test_output"
         })
         
-        # Render command template
-        from jinja2 import Environment
-        jinja_env = Environment()
-        template = jinja_env.from_string(ai_json_operator.command_template)
-        rendered_command = template.render(**executor.params)
+        # Render command template (compiled once, then served from the template cache)
+        rendered_command = executor.render_command()
+        template = _compile_template(ai_json_operator.command_template)
+        assert _compile_template(ai_json_operator.command_template) is template
+        assert executor.render_command() == rendered_command
         
         # Verify rendered command
         assert "Conv Add" in rendered_command, "ops parameter not rendered"
@@ -170,9 +175,8 @@ class TestE2EIntegration:
         assert "--max-retries 3" in rendered_command, "max_retries parameter not rendered"
         assert "-o test_output" in rendered_command, "output_dir parameter not rendered"
     
-    def test_scenario_step_dependencies(self):
+    def test_scenario_step_dependencies(self, scenarios):
         """Test scenario step dependency resolution"""
-        scenarios = load_scenarios_from_directory("scenarios")
         e2e_scenario = scenarios["e2e-onnx-to-atc"]
         
         # Find steps with dependencies
@@ -186,10 +190,8 @@ class TestE2EIntegration:
             for dependency in step.depends_on:
                 assert dependency in step_names, f"Invalid dependency '{dependency}' in step '{step.name}'"
     
-    def test_validation_rules(self):
+    def test_validation_rules(self, tools):
         """Test tool validation rules"""
-        tools = load_tools_from_directory("tools")
-        
         # Test tools with validation rules
         tools_with_validation = [tool for tool in tools.values() if tool.validation]
         assert len(tools_with_validation) > 0, "No tools with validation rules found"
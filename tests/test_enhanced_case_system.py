@@ -2,6 +2,7 @@
 Tests for the enhanced test case system including validation and data-driven testing.
 """
 import pytest
+import shutil
 import tempfile
 import yaml
 import json
@@ -57,7 +58,6 @@ class TestValidationEngine:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_exit_code_validation_success(self):
@@ -199,7 +199,6 @@ class TestDataProviders:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_csv_data_provider(self):
@@ -405,7 +404,6 @@ class TestDataDrivenIntegration:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_parameter_mapping_simple(self):
@@ -2,6 +2,7 @@
 Tests for enhanced data-driven testing features.
 """
 import pytest
+import shutil
 import tempfile
 import json
 import csv
@@ -9,7 +10,7 @@ import yaml
 from pathlib import Path
 from unittest.mock import Mock, patch
 from dact.models import Case, CaseFile, DataDrivenCase, CaseValidation
-from dact.pytest_plugin import CaseYAMLFile
+from dact.pytest_plugin import CaseYAMLFile, _parse_transform
 
 
 class TestEnhancedDataDrivenFeatures:
@@ -21,15 +22,10 @@ class TestEnhancedDataDrivenFeatures:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_data_filter_simple_equality(self):
         """Test data filtering with simple equality."""
-        # Create mock CaseYAMLFile instance
-        yaml_file = Mock()
-        yaml_file._filter_test_data = CaseYAMLFile._filter_test_data.__get__(yaml_file, CaseYAMLFile)
-        
         test_data = [
             {"name": "test1", "category": "unit", "priority": "high"},
             {"name": "test2", "category": "integration", "priority": "low"},
@@ -38,16 +34,13 @@ class TestEnhancedDataDrivenFeatures:
         
         filter_criteria = {"category": "unit"}
         
-        filtered_data = yaml_file._filter_test_data(test_data, filter_criteria)
+        filtered_data = CaseYAMLFile._filter_test_data(test_data, filter_criteria)
         
         assert len(filtered_data) == 2
         assert all(row["category"] == "unit" for row in filtered_data)
     
     def test_data_filter_complex_operations(self):
         """Test data filtering with complex operations."""
-        yaml_file = Mock()
-        yaml_file._filter_test_data = CaseYAMLFile._filter_test_data.__get__(yaml_file, CaseYAMLFile)
-        
         test_data = [
             {"name": "test1", "score": 85, "category": "unit"},
             {"name": "test2", "score": 92, "category": "integration"},
@@ -60,16 +53,13 @@ class TestEnhancedDataDrivenFeatures:
             "score": {"$gt": 80, "$lt": 95}
         }
         
-        filtered_data = yaml_file._filter_test_data(test_data, filter_criteria)
+        filtered_data = CaseYAMLFile._filter_test_data(test_data, filter_criteria)
         
         assert len(filtered_data) == 2
         assert all(80 < row["score"] < 95 for row in filtered_data)
     
     def test_data_filter_in_operation(self):
         """Test data filtering with $in operation."""
-        yaml_file = Mock()
-        yaml_file._filter_test_data = CaseYAMLFile._filter_test_data.__get__(yaml_file, CaseYAMLFile)
-        
         test_data = [
             {"name": "test1", "platform": "linux"},
             {"name": "test2", "platform": "windows"},
@@ -81,16 +71,13 @@ class TestEnhancedDataDrivenFeatures:
             "platform": {"$in": ["linux", "windows"]}
         }
         
-        filtered_data = yaml_file._filter_test_data(test_data, filter_criteria)
+        filtered_data = CaseYAMLFile._filter_test_data(test_data, filter_criteria)
         
         assert len(filtered_data) == 2
         assert all(row["platform"] in ["linux", "windows"] for row in filtered_data)
     
     def test_data_transform_type_conversion(self):
         """Test data transformation with type conversion."""
-        yaml_file = Mock()
-        yaml_file._transform_data_row = CaseYAMLFile._transform_data_row.__get__(yaml_file, CaseYAMLFile)
-        
         data_row = {
             "batch_size": "32",
             "learning_rate": "0.001",
@@ -103,7 +90,7 @@ class TestEnhancedDataDrivenFeatures:
             "epochs_str": "str(epochs)"
         }
         
-        transformed_row = yaml_file._transform_data_row(data_row, transformations)
+        transformed_row = CaseYAMLFile._transform_data_row(data_row, transformations)
         
         assert transformed_row["batch_size_int"] == 32
         assert transformed_row["learning_rate_float"] == 0.001
@@ -114,9 +101,6 @@ class TestEnhancedDataDrivenFeatures:
     
     def test_data_transform_arithmetic(self):
         """Test data transformation with arithmetic operations."""
-        yaml_file = Mock()
-        yaml_file._transform_data_row = CaseYAMLFile._transform_data_row.__get__(yaml_file, CaseYAMLFile)
-        
         data_row = {
             "width": 224,
             "height": 224,
@@ -128,16 +112,13 @@ class TestEnhancedDataDrivenFeatures:
             "input_shape": "channels"  # Simple mapping
         }
         
-        transformed_row = yaml_file._transform_data_row(data_row, transformations)
+        transformed_row = CaseYAMLFile._transform_data_row(data_row, transformations)
         
         assert transformed_row["total_pixels"] == 448  # 224 + 224
         assert transformed_row["input_shape"] == 3
     
     def test_data_transform_literal_values(self):
         """Test data transformation with literal values."""
-        yaml_file = Mock()
-        yaml_file._transform_data_row = CaseYAMLFile._transform_data_row.__get__(yaml_file, CaseYAMLFile)
-        
         data_row = {
             "model_name": "resnet50"
         }
@@ -148,12 +129,24 @@ class TestEnhancedDataDrivenFeatures:
             "model": "model_name"    # Key mapping
         }
         
-        transformed_row = yaml_file._transform_data_row(data_row, transformations)
+        transformed_row = CaseYAMLFile._transform_data_row(data_row, transformations)
         
         assert transformed_row["framework"] == "pytorch"
         assert transformed_row["device"] == "cuda"
         assert transformed_row["model"] == "resnet50"
     
+    def test_data_transform_parsed_once(self):
+        """Test that each transform expression is parsed once and reused across rows."""
+        transformations = {"batch_size_int": "int(batch_size)"}
+        
+        first = CaseYAMLFile._transform_data_row({"batch_size": "8"}, transformations)
+        parsed = _parse_transform("int(batch_size)")
+        second = CaseYAMLFile._transform_data_row({"batch_size": "16"}, transformations)
+        
+        assert first["batch_size_int"] == 8
+        assert second["batch_size_int"] == 16
+        assert id(_parse_transform("int(batch_size)")) == id(parsed)
+    
     def test_case_name_template_rendering(self):
         """Test case name template rendering."""
         yaml_file = Mock()
@@ -252,7 +245,6 @@ class TestDataDrivenIntegrationScenarios:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_model_testing_scenario(self):
@@ -2,13 +2,15 @@
 Tests for the enhanced validation system with new validation types.
 """
 import pytest
+import shutil
 import tempfile
 import json
+import re
 import yaml
 from pathlib import Path
 from unittest.mock import Mock, patch
 from dact.models import CaseValidation
-from dact.validation_engine import ValidationEngine, ValidationResult
+from dact.validation_engine import ValidationEngine, ValidationResult, _CaseCache
 
 
 class TestEnhancedValidationTypes:
@@ -21,7 +23,6 @@ class TestEnhancedValidationTypes:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_file_content_validation_exact_match(self):
@@ -43,6 +44,24 @@ class TestEnhancedValidationTypes:
         assert result.is_valid
         assert "Expected file content to match exactly" in result.message
     
+    def test_file_content_exact_match_skips_decoding(self):
+        """Test that an exact byte match is accepted without decoding the file."""
+        (self.temp_dir / "content.txt").write_bytes("naïve résumé\n".encode("utf-8"))
+        validation = CaseValidation(type="file_content", target="content.txt", expected="naïve résumé\n")
+        
+        with patch.object(_CaseCache, "read_text") as mock_read_text:
+            result = self.engine._execute_validation(validation, {}, self.temp_dir)
+        
+        assert result.is_valid
+        assert result.details["content_length"] == len("naïve résumé\n")
+        mock_read_text.assert_not_called()
+        
+        # Mismatches and CRLF files still go through the decoding path
+        (self.temp_dir / "content.txt").write_bytes(b"naive\r\n")
+        crlf = CaseValidation(type="file_content", target="content.txt", expected="naive\n")
+        assert self.engine._execute_validation(crlf, {}, self.temp_dir).is_valid
+        assert not self.engine._execute_validation(validation, {}, self.temp_dir).is_valid
+    
     def test_file_content_validation_pattern_match(self):
         """Test file content validation with pattern matching."""
         # Create test file
@@ -60,6 +79,38 @@ class TestEnhancedValidationTypes:
         
         assert result.is_valid
     
+    def test_regex_patterns_compiled_once(self):
+        """Test that regex patterns are compiled once and invalid ones stay cached."""
+        validation = CaseValidation(type="output_matches", target="result", pattern=r"^\d+$")
+        execution_result = {"outputs": {"result": "42"}}
+        
+        with patch("dact.validation_engine.re.compile", wraps=re.compile) as mock_compile:
+            assert self.engine._execute_validation(validation, execution_result, self.temp_dir).is_valid
+            assert self.engine._execute_validation(validation, execution_result, self.temp_dir).is_valid
+            assert mock_compile.call_count == 1
+            
+            bad = CaseValidation(type="output_matches", target="result", pattern="(")
+            for _ in range(2):
+                result = self.engine._execute_validation(bad, execution_result, self.temp_dir)
+                assert not result.is_valid
+                assert "Invalid regex pattern" in result.message
+            assert mock_compile.call_count == 2
+    
+    def test_redundant_wildcards_do_not_change_matches(self):
+        """Test that outer .* in patterns are dropped without changing results."""
+        from dact.validation_engine import _strip_redundant_wildcards
+        
+        assert _strip_redundant_wildcards(".*error.*") == "error"
+        assert _strip_redundant_wildcards("^.*error") == "^.*error"
+        assert _strip_redundant_wildcards(r"error\.*") == r"error\.*"
+        
+        outputs = {"log": "line one\nfatal error: disk\n"}
+        for pattern, expected in [(".*error.*", True), ("^.*error", False), (".*missing", False)]:
+            validation = CaseValidation(type="output_matches", target="log", pattern=pattern)
+            result = self.engine._execute_validation(validation, {"outputs": outputs}, self.temp_dir)
+            assert result.is_valid is expected
+            assert pattern in result.message
+    
     def test_file_content_validation_encoding(self):
         """Test file content validation with different encoding."""
         # Create test file with UTF-8 content
@@ -139,8 +190,9 @@ class TestEnhancedValidationTypes:
     @patch('dact.validation_engine.jsonschema')
     def test_json_schema_validation_success(self, mock_jsonschema):
         """Test JSON schema validation success."""
-        # Mock jsonschema validation
-        mock_jsonschema.validate.return_value = None  # No exception means valid
+        # Mock jsonschema validation: a validator reporting no errors means valid
+        mock_validator = mock_jsonschema.validators.validator_for.return_value.return_value
+        mock_validator.iter_errors.return_value = []
         
         # Create test JSON file
         test_file = self.temp_dir / "data.json"
@@ -168,16 +220,20 @@ class TestEnhancedValidationTypes:
         
         assert result.is_valid
         assert "validates against schema" in result.message
-        mock_jsonschema.validate.assert_called_once()
+        mock_validator.iter_errors.assert_called_once_with(test_data)
+        
+        # The validator is built once and reused for an equal schema
+        self.engine._execute_validation(validation.model_copy(), execution_result, self.temp_dir)
+        assert mock_jsonschema.validators.validator_for.call_count == 1
     
     @patch('dact.validation_engine.jsonschema')
     def test_json_schema_validation_failure(self, mock_jsonschema):
         """Test JSON schema validation failure."""
         from jsonschema import ValidationError
         
-        # Mock jsonschema validation to raise error
-        mock_jsonschema.validate.side_effect = ValidationError("'name' is a required property")
-        mock_jsonschema.ValidationError = ValidationError
+        # Mock jsonschema validation to report an error
+        mock_validator = mock_jsonschema.validators.validator_for.return_value.return_value
+        mock_validator.iter_errors.return_value = [ValidationError("'name' is a required property")]
         
         # Create test JSON file
         test_file = self.temp_dir / "invalid.json"
@@ -206,6 +262,19 @@ class TestEnhancedValidationTypes:
         assert not result.is_valid
         assert "JSON schema validation failed" in result.message
     
+    def test_xml_schema_compiled_once_per_source(self):
+        """Test that an XSD is parsed and compiled once and then reused."""
+        etree = Mock()
+        xsd = '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"/>'
+        
+        first = self.engine._xml_schema(etree, xsd)
+        second = self.engine._xml_schema(etree, xsd)
+        
+        assert first is second is etree.XMLSchema.return_value
+        etree.XMLSchema.assert_called_once()
+        # Only the XSD is parsed with a shared parser; documents use lxml's per-thread default
+        etree.XMLParser.assert_called_once_with(remove_blank_text=True)
+    
     def test_numeric_range_validation_success(self):
         """Test numeric range validation success."""
         validation = CaseValidation(
@@ -333,7 +402,6 @@ class TestValidationEngineIntegration:
     
     def teardown_method(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
     
     def test_multiple_validations_all_pass(self):
@@ -378,6 +446,120 @@ class TestValidationEngineIntegration:
         assert not results[1].is_valid  # file_exists fails
         assert results[2].is_valid  # stdout_contains passes
     
+    def test_file_stats_shared_within_a_case(self):
+        """Test that validations of one case stat each file once."""
+        (self.temp_dir / "output.txt").write_text("12345")
+        
+        validations = [
+            CaseValidation(type="file_exists", target="output.txt"),
+            CaseValidation(type="file_size", target="output.txt", expected=5),
+            CaseValidation(type="file_not_exists", target="output.txt")
+        ]
+        
+        with patch.object(Path, "stat", autospec=True, side_effect=Path.stat) as mock_stat:
+            results = self.engine.validate_case(validations, {}, self.temp_dir)
+            assert mock_stat.call_count == 1
+            
+            # A new case re-reads the file system
+            self.engine.validate_case(validations[:1], {}, self.temp_dir)
+            assert mock_stat.call_count == 2
+        
+        assert [r.is_valid for r in results] == [True, True, False]
+    
+    def test_file_read_once_per_case(self):
+        """Test that content validations of one file share a single read."""
+        (self.temp_dir / "data.json").write_text('{"status": "ok"}\r\n')
+        
+        validations = [
+            CaseValidation(type="file_content", target="data.json", pattern=r'"status": "ok"}\n$'),
+            CaseValidation(type="file_content", target="data.json", expected='{"status": "ok"}\n')
+        ]
+        
+        with patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as mock_read:
+            results = self.engine.validate_case(validations, {}, self.temp_dir)
+        
+        assert mock_read.call_count == 1
+        assert all(r.is_valid for r in results)
+    
+    def test_several_substring_checks_on_one_stream(self):
+        """Test that several substring checks on one stream agree with plain `in`."""
+        validations = [
+            CaseValidation(type="stdout_contains", expected="compile ok"),
+            CaseValidation(type="stdout_contains", expected="ok"),
+            CaseValidation(type="stdout_contains", expected="missing"),
+            CaseValidation(type="stderr_not_contains", expected="error"),
+            CaseValidation(type="stderr_not_contains", expected="warning: x")
+        ]
+        execution_result = {"stdout": "step1: compile ok\n", "stderr": "warning: xyz\n"}
+        
+        results = self.engine.validate_case(validations, execution_result, self.temp_dir)
+        
+        assert [r.is_valid for r in results] == [True, True, False, True, False]
+    
+    def test_fail_fast_skips_expensive_validations(self):
+        """Test that fail_fast skips expensive checks after a critical failure."""
+        validations = [
+            CaseValidation(type="file_content", target="out.txt", expected="done"),
+            CaseValidation(type="exit_code", expected=0),
+            CaseValidation(type="stdout_contains", expected="done")
+        ]
+        execution_result = {"returncode": 1, "stdout": "done"}
+        
+        with patch.object(self.engine, "_validate_file_content") as mock_content:
+            results = self.engine.validate_case(validations, execution_result, self.temp_dir, fail_fast=True)
+        
+        mock_content.assert_not_called()
+        assert results[0].details == {"skipped": True}
+        assert not results[1].is_valid
+        assert results[2].is_valid
+        
+        # Without fail_fast everything runs
+        results = self.engine.validate_case(validations, execution_result, self.temp_dir)
+        assert "does not exist" in results[0].message
+    
+    def test_file_validations_run_in_thread_pool(self):
+        """Test that I/O-heavy cases validate concurrently with results in order."""
+        import threading
+        for i in range(4):
+            (self.temp_dir / f"out{i}.txt").write_text(str(i))
+        validations = [CaseValidation(type="file_content", target=f"out{i}.txt", expected=str(i))
+                       for i in range(4)]
+        validations.append(CaseValidation(type="exit_code", expected=0))
+        
+        barrier = threading.Barrier(4, timeout=5)
+        original = self.engine._validate_file_content
+        
+        def concurrent_content(*args):
+            barrier.wait()  # Would time out if the file checks ran one after another
+            return original(*args)
+        
+        with patch.object(self.engine, "_validate_file_content", side_effect=concurrent_content):
+            results = self.engine.validate_case(validations, {"returncode": 1}, self.temp_dir)
+        
+        assert [r.is_valid for r in results] == [True, True, True, True, False]
+        assert "exit code" in results[4].message
+    
+    def test_xml_schema_validations_overlap(self):
+        """Test that xml_schema validations only serialize on the schema cache, not while validating."""
+        import sys
+        import threading
+        barrier = threading.Barrier(4, timeout=5)
+        etree = Mock()
+        etree.XMLSyntaxError = type("XMLSyntaxError", (Exception,), {})
+        etree.DocumentInvalid = type("DocumentInvalid", (Exception,), {})
+        # Would time out if the documents were validated one after another
+        # Mock reserves assert* names, so the schema is a plain object
+        etree.XMLSchema.return_value = type("Schema", (), {"assertValid": lambda self, doc: barrier.wait()})()
+        lxml = Mock(etree=etree)
+        validations = [CaseValidation(type="xml_schema", target=f"doc{i}", validation_schema={"xsd": "<xs:schema/>"})
+                       for i in range(4)]
+        execution_result = {"outputs": {f"doc{i}": "<doc/>" for i in range(4)}}
+        
+        with patch.dict(sys.modules, {"lxml": lxml, "lxml.etree": etree}):
+            results = self.engine.validate_case(validations, execution_result, self.temp_dir)
+        
+        assert all(r.is_valid for r in results), [r.message for r in results]
+    
     def test_validation_exception_handling(self):
         """Test that validation exceptions are properly handled."""
         # Create a validation that will cause an exception
@@ -1,3 +1,4 @@
+import sys
 import pytest
 from pydantic import ValidationError
 from dact.models import Tool, Scenario, Case, CaseFile
@@ -58,3 +59,14 @@ def test_case_file_model_validation():
     # Invalid case data (missing name)
     with pytest.raises(ValidationError):
         CaseFile(cases=[{"scenario": "my-scenario"}])
+
+
+def test_reference_names_are_interned():
+    """Tests that tool/scenario references are interned on parse."""
+    tool_name = "".join(["my-", "tool"])
+    scenario = Scenario(name="my-scenario", steps=[{"name": "step1", "tool": tool_name}])
+    assert scenario.steps[0].tool is sys.intern("my-tool")
+
+    case = Case(name="my-case", scenario="".join(["my-", "scenario"]))
+    assert case.scenario is sys.intern("my-scenario")
+    assert case.tool is None
@@ -0,0 +1,58 @@
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from dact.models import Case, Scenario, Step, Tool
+from dact.runner import _reset_work_dir, run_case
+
+@pytest.fixture
+def parallel_catalog():
+    """A scenario with two independent steps, i.e. a single execution layer."""
+    tools = {"echo-tool": Tool(name="echo-tool", command_template="echo {{ message }}")}
+    scenario = Scenario(
+        name="parallel-scenario",
+        steps=[
+            Step(name="step_a", tool="echo-tool", params={"message": "a"}),
+            Step(name="step_b", tool="echo-tool", params={"message": "b"}),
+        ],
+    )
+    return tools, {scenario.name: scenario}
+
+def test_run_case_runs_independent_steps_in_parallel(parallel_catalog, tmp_path: Path):
+    """
+    Tests that steps in the same execution layer run concurrently.
+    """
+    # Each step waits for its sibling; run one after another, the first wait times out
+    barrier = threading.Barrier(2, timeout=5)
+    ran = []
+
+    def run_step(tool, params, step_dir, debug=False, progress=None):
+        barrier.wait()
+        ran.append(step_dir.name)
+        return {"returncode": 0, "outputs": {}, "command": f"echo {params['message']}"}
+
+    case = Case(name="parallel_case", scenario="parallel-scenario")
+    with patch("dact.runner._run_step", side_effect=run_step):
+        result = run_case(case, tmp_path, catalog=parallel_catalog)
+
+    assert result.success, result.errors
+    assert sorted(ran) == ["step_a", "step_b"]
+
+def test_reset_work_dir_sweeps_leftover_trash(tmp_path: Path):
+    """
+    Tests that trash directories left behind by a killed run are removed with the next one.
+    """
+    leftover = tmp_path / "old_case.trash-0123abcd"
+    (leftover / "step").mkdir(parents=True)
+    (leftover / "step" / "stdout.log").write_text("stale", encoding="utf-8")
+    work_dir = tmp_path / "case"
+    work_dir.mkdir()
+    (work_dir / "stdout.log").write_text("previous run", encoding="utf-8")
+
+    before = set(threading.enumerate())
+    _reset_work_dir(work_dir)
+    for thread in set(threading.enumerate()) - before:
+        thread.join(timeout=5)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["case"]
+    assert not any(work_dir.iterdir())
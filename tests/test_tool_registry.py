@@ -4,6 +4,7 @@ Unit tests for the enhanced tool registry system.
 
 import pytest
 import subprocess
+import sys
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
@@ -49,7 +50,7 @@ class TestRealToolAdapter:
         
         assert adapter.name == "test-tool"
         assert adapter.executable_name == "test-executable"
-        assert adapter._cached_availability is None
+        assert adapter._cached is None
     
     @patch('shutil.which')
     def test_find_executable_found(self, mock_which):
@@ -138,7 +139,20 @@ class TestRealToolAdapter:
         assert result.available is False
         assert result.path == "/usr/bin/test-tool"
         assert "timed out" in result.error_message
-    
+
+    @patch('subprocess.run')
+    def test_version_check_uses_resolved_path(self, mock_run):
+        """Test that the version check reuses the resolved executable and its timeout."""
+        mock_run.return_value = Mock(returncode=0, stdout="test-tool version 1.2.0\n")
+        adapter = MockRealToolAdapter("test-tool", "test-tool")
+        adapter.timeout_seconds = 0.5
+
+        adapter.check_availability()
+
+        args, kwargs = mock_run.call_args
+        assert args[0] == ["/usr/bin/test-tool", "--version"]
+        assert kwargs["timeout"] == 0.5
+
     @patch('subprocess.run')
     @patch('shutil.which')
     def test_check_availability_caching(self, mock_which, mock_run):
@@ -180,6 +194,47 @@ class TestRealToolAdapter:
         assert result1.available == result2.available
         # subprocess.run should be called twice
         assert mock_run.call_count == 2
+    
+    @patch('subprocess.run')
+    @patch('dact.tool_registry.time.monotonic')
+    def test_check_availability_cache_expires(self, mock_monotonic, mock_run):
+        """Test that cached availability expires after ttl_seconds."""
+        mock_run.return_value = Mock(
+            returncode=0,
+            stdout="test-tool version 1.2.0\n"
+        )
+        adapter = MockRealToolAdapter("test-tool", "test-tool")
+        adapter.ttl_seconds = 30.0
+        
+        mock_monotonic.return_value = 100.0
+        adapter.check_availability()
+        mock_monotonic.return_value = 129.0
+        adapter.check_availability()
+        assert mock_run.call_count == 1
+        
+        mock_monotonic.return_value = 131.0
+        adapter.check_availability()
+        assert mock_run.call_count == 2
+    
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    @patch('dact.tool_registry.time.monotonic')
+    def test_expired_availability_looks_executable_up_again(self, mock_monotonic, mock_which, mock_run):
+        """Test that an expired result re-resolves the executable on an unchanged PATH."""
+        mock_run.return_value = Mock(returncode=0, stdout="late-tool version 1.2.0\n")
+        adapter = MockRealToolAdapter("late-tool", "late-tool")
+        adapter.find_executable = RealToolAdapter.find_executable.__get__(adapter)
+        adapter.ttl_seconds = 30.0
+        
+        with patch.dict('os.environ', {"PATH": "/opt/late/bin"}):
+            mock_which.return_value = None
+            mock_monotonic.return_value = 100.0
+            assert not adapter.check_availability().available
+            
+            # Installed while the negative result was cached
+            mock_which.return_value = "/opt/late/bin/late-tool"
+            mock_monotonic.return_value = 131.0
+            assert adapter.check_availability().available
 
 
 class TestToolRegistry:
@@ -322,6 +377,62 @@ class TestToolRegistry:
         assert result[0].name == "a-tool"
         assert result[1].name == "z-tool"
     
+    def test_list_tools_yaml_tool_shadows_adapter(self):
+        """Test that a YAML tool and an adapter sharing a name are listed once."""
+        self.registry.register_real_tool_adapter(MockRealToolAdapter("test-tool", "test-executable"))
+        self.registry.register_tool(self.test_tool)
+        self.registry.register_real_tool_adapter(MockRealToolAdapter("b-tool", "b-executable"))
+
+        result = self.registry.list_tools(include_availability=False)
+
+        assert [info.name for info in result] == ["b-tool", "test-tool"]
+        assert result[1].type == ToolType.SHELL
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+    def test_result_dataclasses_use_slots(self):
+        """Test that listing results don't carry a per-instance __dict__."""
+        self.registry.register_tool(self.test_tool)
+
+        info = self.registry.list_tools()[0]
+        details = self.registry.get_tool_details("test-tool")
+        availability = self.registry.validate_tool_availability("test-tool")
+
+        for obj in (info, details, availability):
+            assert not hasattr(obj, "__dict__")
+
+    def test_list_tools_without_availability(self):
+        """Test that listing names only skips availability checks."""
+        self.registry.register_tool(self.test_tool)
+        adapter = MockRealToolAdapter("real-tool", "real-executable")
+        self.registry.register_real_tool_adapter(adapter)
+        
+        with patch.object(adapter, 'check_availability') as mock_check:
+            result = self.registry.list_tools(include_availability=False)
+        
+        mock_check.assert_not_called()
+        assert [info.name for info in result] == ["real-tool", "test-tool"]
+        assert all(info.available is None and info.version is None for info in result)
+    
+    def test_list_tools_checks_adapters_concurrently(self):
+        """Test that cold adapter version checks run in parallel."""
+        import threading
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def probe(name):
+            # Each probe waits for the other two: only passes if all run at once
+            barrier.wait()
+            return ToolAvailability(name=name, available=True)
+        
+        for name in ("a-real", "b-real", "c-real"):
+            adapter = MockRealToolAdapter(name, f"{name}-executable")
+            adapter._probe_availability = lambda n=name: probe(n)
+            self.registry.register_real_tool_adapter(adapter)
+        
+        result = self.registry.list_tools()
+        
+        assert [info.name for info in result] == ["a-real", "b-real", "c-real"]
+        assert all(info.available for info in result)
+    
     def test_get_tool_details_yaml_tool(self):
         """Test getting details for YAML-defined tool."""
         self.registry.register_tool(self.test_tool)
@@ -337,7 +448,17 @@ class TestToolRegistry:
         assert "input" in result.parameters
         assert "output" in result.parameters
         assert result.validation_rules is not None
-    
+
+    def test_get_tool_details_reuses_parameter_dicts(self):
+        """Test that parameter/validation dicts are built once at registration."""
+        self.registry.register_tool(self.test_tool)
+
+        first = self.registry.get_tool_details("test-tool")
+        second = self.registry.get_tool_details("test-tool")
+
+        assert first.parameters is second.parameters
+        assert first.validation_rules is second.validation_rules
+
     def test_get_tool_details_real_adapter(self):
         """Test getting details for real tool adapter."""
         adapter = MockRealToolAdapter("real-tool", "real-executable")
@@ -431,15 +552,65 @@ class TestToolRegistry:
         adapter = MockRealToolAdapter("real-tool", "real-executable")
         self.registry.register_real_tool_adapter(adapter)
         
-        # Populate cache
-        self.registry.validate_tool_availability("real-tool")
-        assert len(self.registry._tool_availability_cache) > 0
-        
-        # Clear cache
-        self.registry.clear_availability_cache()
-        assert len(self.registry._tool_availability_cache) == 0
-        assert adapter._cached_availability is None
+        with patch.object(adapter, '_probe_availability') as mock_probe:
+            mock_probe.return_value = ToolAvailability(name="real-tool", available=True)
+            
+            # Populate cache
+            self.registry.validate_tool_availability("real-tool")
+            self.registry.validate_tool_availability("real-tool")
+            assert mock_probe.call_count == 1
+            
+            # Clearing bumps the generation, so both registry and adapter caches are stale
+            self.registry.clear_availability_cache()
+            self.registry.validate_tool_availability("real-tool")
+            assert mock_probe.call_count == 2
     
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    def test_clear_availability_cache_finds_new_executable(self, mock_which, mock_run):
+        """Test that clearing the cache finds a tool installed on an unchanged PATH."""
+        mock_run.return_value = Mock(returncode=0, stdout="new-tool version 1.2.0\n")
+        adapter = MockRealToolAdapter("new-tool", "new-tool")
+        adapter.find_executable = RealToolAdapter.find_executable.__get__(adapter)
+        self.registry.register_real_tool_adapter(adapter)
+        
+        with patch.dict('os.environ', {"PATH": "/opt/new/bin"}):
+            mock_which.return_value = None
+            assert not self.registry.validate_tool_availability("new-tool").available
+            
+            mock_which.return_value = "/opt/new/bin/new-tool"
+            self.registry.clear_availability_cache()
+            assert self.registry.validate_tool_availability("new-tool").available
+
+    def test_refresh_all_async(self):
+        """Test refreshing all adapters through asyncio subprocesses."""
+        import asyncio
+
+        class PythonVersionAdapter(MockRealToolAdapter):
+            def __init__(self, name, version):
+                super().__init__(name, "python")
+                self._reported = version
+
+            @property
+            def version_check_command(self) -> list:
+                return [sys.executable, "-c", f"print('tool version {self._reported}')"]
+
+        new = PythonVersionAdapter("new-tool", "2.3.1")
+        old = PythonVersionAdapter("old-tool", "0.9.0")
+        self.registry.register_real_tool_adapter(new)
+        self.registry.register_real_tool_adapter(old)
+
+        results = asyncio.run(self.registry.refresh_all_async())
+
+        assert results["new-tool"].available is True
+        assert results["new-tool"].version == "2.3.1"
+        assert results["old-tool"].available is False
+        assert "not compatible" in results["old-tool"].error_message
+        # Results land in the registry cache
+        with patch.object(new, 'check_availability') as mock_check:
+            assert self.registry.validate_tool_availability("new-tool") is results["new-tool"]
+            mock_check.assert_not_called()
+
     def test_get_available_tools(self):
         """Test getting list of available tools."""
         # Add available tool
@@ -481,6 +652,20 @@ class TestToolRegistry:
         
         assert "test-tool" not in result
         assert "unavailable-tool" in result
+    
+    def test_available_and_unavailable_share_one_pass(self):
+        """Test that asking for both partitions only lists tools once."""
+        self.registry.register_tool(self.test_tool)
+        
+        with patch.object(self.registry, 'list_tools', wraps=self.registry.list_tools) as mock_list:
+            assert self.registry.get_available_tools() == ["test-tool"]
+            assert self.registry.get_unavailable_tools() == []
+            assert mock_list.call_count == 1
+            
+            # Registering a tool invalidates the partition
+            self.registry.register_tool(Tool(name="other-tool", command_template="echo"))
+            assert self.registry.get_available_tools() == ["other-tool", "test-tool"]
+            assert mock_list.call_count == 2
 
 
 class TestGlobalRegistry:
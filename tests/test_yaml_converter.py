@@ -0,0 +1,63 @@
+import pytest
+from pathlib import Path
+from dact.yaml_converter import convert_case_yaml_to_py, convert_directory
+
+CASE_YAML = """\
+cases:
+  - name: {name}
+    tool: echo-tool
+"""
+
+
+@pytest.fixture
+def case_tree(tmp_path):
+    """A case directory with YAML files in a subdirectory, a hidden one and dact_outputs."""
+    for rel, name in [("a.case.yml", "case_a"), ("sub/b.case.yml", "case_b"),
+                      (".hidden/c.case.yml", "case_c"), ("dact_outputs/d.case.yml", "case_d")]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(CASE_YAML.format(name=name), encoding="utf-8")
+    return tmp_path
+
+
+def test_convert_directory_skips_hidden_and_output_dirs(case_tree):
+    paths = convert_directory(str(case_tree), max_workers=1)
+
+    assert [Path(p).relative_to(case_tree).as_posix() for p in paths] == [
+        "test_a_generated.py", "sub/test_b_generated.py"
+    ]
+
+
+def test_convert_directory_with_output_py_writes_one_module(case_tree, tmp_path_factory):
+    out = tmp_path_factory.mktemp("gen") / "test_all_cases.py"
+
+    paths = convert_directory(str(case_tree), output_py=str(out))
+
+    assert paths == [str(out)]
+    content = out.read_text(encoding="utf-8")
+    assert "'case_a'" in content and "'case_b'" in content
+    assert "'case_c'" not in content and "'case_d'" not in content
+
+
+def test_convert_regenerates_output_from_an_older_converter(case_tree):
+    out = Path(convert_case_yaml_to_py(str(case_tree / "a.case.yml")))
+    generated = out.read_text(encoding="utf-8")
+    # Newer than the YAML, but written by a different converter version
+    out.write_text("# Generated by dact gen-py 000000000000 from a.case.yml\n", encoding="utf-8")
+
+    convert_case_yaml_to_py(str(case_tree / "a.case.yml"))
+
+    assert out.read_text(encoding="utf-8") == generated
+
+
+def test_convert_force_rewrites_up_to_date_output(case_tree):
+    out = Path(convert_case_yaml_to_py(str(case_tree / "a.case.yml")))
+    generated = out.read_text(encoding="utf-8")
+    edited = generated + "# local edit\n"
+    out.write_text(edited, encoding="utf-8")
+
+    convert_case_yaml_to_py(str(case_tree / "a.case.yml"))
+    assert out.read_text(encoding="utf-8") == edited
+
+    convert_case_yaml_to_py(str(case_tree / "a.case.yml"), force=True)
+    assert out.read_text(encoding="utf-8") == generated